@@ -1,20 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
-from datetime import timedelta
-from sqlmodel import Session, select
+from datetime import datetime, timedelta
+from sqlmodel import select
 from typing import Optional
-from ..database import get_session
+from ..database import DatabaseSession, get_session
+from ..dependencies import decode_token, security, token_revocations
 from ..models.user import User, UserCreate, UserRead, UserLogin
-from ..utils.password import get_password_hash, verify_password
+from ..utils.password import PasswordPoolBusy, get_password_hash_async, verify_password_async
 from ..utils.auth import create_access_token
 from ..config import settings
 
 router = APIRouter()
 
+def password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=UserRead)
-async def register(user: UserCreate, session: Session = Depends(get_session)):
+async def register(user: UserCreate, session: DatabaseSession = Depends(get_session)):
     # Check if user already exists
-    existing_user = session.exec(select(User).where(User.email == user.email)).first()
+    existing_user = (await session.exec(select(User).where(User.email == user.email))).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -22,21 +30,30 @@ async def register(user: UserCreate, session: Session = Depends(get_session)):
         )
 
     # Hash password and create user
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await get_password_hash_async(user.password)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
     db_user = User(
         email=user.email,
         name=user.name,
         password_hash=hashed_password
     )
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await session.refresh(db_user)
     return db_user
 
 @router.post("/login")
-async def login(user_credentials: UserLogin, session: Session = Depends(get_session)):
-    user = session.exec(select(User).where(User.email == user_credentials.email)).first()
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+async def login(user_credentials: UserLogin, session: DatabaseSession = Depends(get_session)):
+    user = (await session.exec(select(User).where(User.email == user_credentials.email))).first()
+    try:
+        password_ok = user is not None and await verify_password_async(
+            user_credentials.password, user.password_hash
+        )
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -60,7 +77,14 @@ async def login(user_credentials: UserLogin, session: Session = Depends(get_sess
     }
 
 @router.post("/logout")
-async def logout(credentials: HTTPAuthorizationCredentials = Depends(HTTPAuthorizationCredentials)):
-    # In a real implementation, you might add the token to a blacklist
-    # For now, we just return a success message
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: DatabaseSession = Depends(get_session)
+):
+    """Revoke the presented token until it expires; other sessions stay signed in"""
+    payload = decode_token(credentials.credentials)
+    if payload.get("jti") is not None:
+        await token_revocations.revoke(
+            payload["jti"], datetime.utcfromtimestamp(payload["exp"]), session
+        )
     return {"message": "Successfully logged out"}
\ No newline at end of file
@@ -1,37 +1,96 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, and_
-from typing import List, Optional
-from datetime import datetime
-from ..database import get_session
-from ..models.task import Task, TaskCreate, TaskRead, TaskUpdate
+import json
+from collections import Counter
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, not_, update
+from sqlmodel import select, and_, or_
+from typing import Optional
+from datetime import datetime, timedelta
+from ..config import settings
+from ..database import DatabaseSession, get_session, session_scope, stream_partitions
+from ..models.task import (
+    Task, TaskBatchItemResult, TaskBatchRequest, TaskBatchResult, TaskChanges, TaskCreate, TaskPage,
+    TaskRead, TaskStats, TaskStatsRead, TaskTombstone, TaskUpdate
+)
 from ..models.user import User
-from ..dependencies import get_current_user
+from ..dependencies import (
+    StreamCredentials, decode_token, get_current_user, get_stream_credentials, security,
+    stream_still_authorized
+)
+from ..utils.events import TaskEventBroker
+from ..utils.auth import create_stream_ticket
+from ..utils.etag import CACHE_CONTROL, etag_matches, make_etag
+from ..utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from ..utils.search import apply_search
+from ..utils.serialization import TASK_READ_COLUMNS, FastJSONResponse, task_row
+from ..utils.sync import (
+    InvalidSyncToken, SyncToken, decode_sync_token, encode_sync_token, safety_window, task_changes_statement
+)
+from ..utils.transfer import (
+    EXPORT_COLUMNS, MEDIA_TYPES, ImportFormatError, export_records, import_fields, iter_records
+)
 
 router = APIRouter()
 
+# Change feed for /stream; handlers publish only after their commit succeeds
+task_events = TaskEventBroker(queue_size=settings.TASK_STREAM_QUEUE_SIZE)
+
+def publish_task(user_id: int, event_type: str, task: Task) -> None:
+    if task_events.has_subscribers(user_id):
+        task_events.publish(user_id, event_type, TaskRead.model_validate(task).model_dump(mode="json"))
+
+def invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+def page_etag(keys, *params) -> str:
+    """ETag of a task page from the (id, updated_at) of the up to limit + 1 rows read for it"""
+    return make_etag(*params, *(f"{task_id}@{updated_at}" for task_id, updated_at in keys))
+
+def task_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Task not found"
+    )
+
 @router.post("/", response_model=TaskRead)
 async def create_task(
     task: TaskCreate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: DatabaseSession = Depends(get_session)
 ):
     db_task = Task(
         **task.dict(),
         user_id=current_user.id
     )
     session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    await session.commit()
+    await session.refresh(db_task)
+    publish_task(current_user.id, "created", db_task)
     return db_task
 
-@router.get("/", response_model=List[TaskRead])
+@router.get("/", response_model=TaskPage)
 async def read_tasks(
     completed: Optional[bool] = None,
     priority: Optional[str] = None,
     search: Optional[str] = None,
+    limit: int = Query(settings.TASKS_DEFAULT_PAGE_SIZE, ge=1, le=settings.TASKS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: DatabaseSession = Depends(get_session)
 ):
+    cursor_value = cursor_id = None
+    if cursor:
+        try:
+            cursor_value, cursor_id = decode_cursor(cursor)
+        except InvalidCursor:
+            raise invalid_cursor()
+
     query = select(Task).where(Task.user_id == current_user.id)
 
     if completed is not None:
@@ -40,24 +99,417 @@ async def read_tasks(
     if priority:
         query = query.where(Task.priority == priority)
 
+    rank = None
     if search:
-        query = query.where(Task.title.contains(search) | Task.description.contains(search))
+        query, rank = apply_search(query, search, session.get_bind().dialect.name)
+
+    # Keyset pagination: continue strictly after the last (sort key, id) seen
+    # so deep pages cost the same as the first one. Plain listings are newest
+    # first; full-text searches are most relevant first.
+    ranked = rank is not None
+    sort_key = rank if ranked else Task.created_at
+
+    if cursor:
+        # Ranked pages carry a float, chronological pages a datetime
+        if isinstance(cursor_value, datetime) == ranked:
+            raise invalid_cursor()
+        past_cursor = sort_key > cursor_value if ranked else sort_key < cursor_value
+        query = query.where(
+            or_(past_cursor, and_(sort_key == cursor_value, Task.id < cursor_id))
+        )
+
+    sort_order = sort_key.asc() if ranked else sort_key.desc()
+    query = query.order_by(sort_order, Task.id.desc()).limit(limit + 1)
+
+    # The ETag covers exactly this page: the (id, updated_at) of its rows plus
+    # the look-ahead row that decides next_cursor. A conditional request first
+    # reads just those keys through the same keyset plan and answers 304
+    # without loading or serializing the tasks; a plain request hashes the
+    # rows it already fetched. Either way the cost is one page, at any depth.
+    if if_none_match:
+        keys = (await session.execute(query.with_only_columns(Task.id, Task.updated_at))).all()
+        etag = page_etag(keys, current_user.id, completed, priority, search, limit, cursor)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+            )
+
+    # Plain tuples rather than ORM objects: no identity map, no pydantic
+    # re-validation, straight to orjson
+    rows = (await session.execute(query.with_only_columns(*TASK_READ_COLUMNS, sort_key))).all()
+    items = [task_row(row) for row in rows]
+    etag = page_etag(
+        ((item["id"], item["updated_at"]) for item in items),
+        current_user.id, completed, priority, search, limit, cursor
+    )
 
-    tasks = session.exec(query).all()
-    return tasks
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(rows[limit - 1][-1], items[-1]["id"])
+
+    return FastJSONResponse(
+        {"items": items, "next_cursor": next_cursor},
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+@router.get("/stats", response_model=TaskStatsRead)
+async def read_task_stats(
+    current_user: User = Depends(get_current_user),
+    session: DatabaseSession = Depends(get_session)
+):
+    """
+    Dashboard counts. Totals come from the trigger-maintained task_stats row;
+    overdue depends on the clock, so it is an index range count over the
+    user's pending tasks with a past due date.
+    """
+    stats = await session.get(TaskStats, current_user.id)
+    overdue = (await session.execute(
+        select(func.count(Task.id)).where(
+            Task.user_id == current_user.id,
+            Task.completed == False,  # noqa: E712
+            Task.due_date < datetime.utcnow()
+        )
+    )).scalar_one()
+
+    total = stats.total if stats else 0
+    completed = stats.completed if stats else 0
+    return TaskStatsRead(
+        total=total,
+        completed=completed,
+        pending=total - completed,
+        high_priority=stats.high_priority if stats else 0,
+        overdue=overdue,
+    )
+
+@router.get("/changes", response_model=TaskChanges)
+async def read_task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(settings.TASKS_SYNC_PAGE_SIZE, ge=1, le=settings.TASKS_SYNC_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    session: DatabaseSession = Depends(get_session)
+):
+    """
+    Delta sync. Without `since` this is a full sync of every live task; after
+    that, pass the returned next_token to get only the tasks created or
+    updated since, plus the ids of deleted tasks. Apply `deleted` before
+    `tasks`, and keep calling while has_more is true.
+
+    Both streams are read by keyset on (timestamp, id), so tasks sharing a
+    timestamp (bulk writes) are never skipped. Changes younger than the
+    safety window (see utils/sync.safety_window) are held back until the
+    next call so a row that commits a while after it was stamped is not missed.
+    A token older than the tombstone retention gets 410 and needs a full sync.
+    """
+    now = datetime.utcnow()
+    horizon = now - safety_window(settings.TASKS_SYNC_SAFETY_WINDOW_SECONDS, settings.SQLITE_BUSY_TIMEOUT_MS)
+    if since:
+        try:
+            token = decode_sync_token(since)
+        except InvalidSyncToken:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid change token"
+            )
+        if token.tombstone_time < now - timedelta(days=settings.TASKS_TOMBSTONE_RETENTION_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Change token expired; perform a full sync"
+            )
+    else:
+        # A fresh client has nothing to delete, only deletes from here on matter
+        token = SyncToken(datetime.min, 0, horizon, 0)
+
+    task_rows = (await session.execute(
+        task_changes_statement(current_user.id, token, horizon, limit + 1)
+    )).all()
+    tombstone_rows = (await session.execute(
+        select(TaskTombstone.deleted_at, TaskTombstone.id, TaskTombstone.task_id)
+        .where(
+            TaskTombstone.user_id == current_user.id,
+            TaskTombstone.deleted_at < horizon,
+            or_(
+                TaskTombstone.deleted_at > token.tombstone_time,
+                and_(TaskTombstone.deleted_at == token.tombstone_time, TaskTombstone.id > token.tombstone_id)
+            )
+        )
+        .order_by(TaskTombstone.deleted_at, TaskTombstone.id)
+        .limit(limit + 1)
+    )).all()
+
+    # A drained stream moves up to the horizon: everything before it has been
+    # delivered, and the tombstone position stays clear of the retention limit
+    tasks = [task_row(row) for row in task_rows[:limit]]
+    if len(task_rows) > limit:
+        task_time, task_id = tasks[-1]["updated_at"], tasks[-1]["id"]
+    else:
+        task_time, task_id = horizon, 0
+    tombstones = tombstone_rows[:limit]
+    if len(tombstone_rows) > limit:
+        tombstone_time, tombstone_id = tombstones[-1][0], tombstones[-1][1]
+    else:
+        tombstone_time, tombstone_id = horizon, 0
+
+    return FastJSONResponse({
+        "tasks": tasks,
+        "deleted": [row[2] for row in tombstones],
+        "next_token": encode_sync_token(SyncToken(task_time, task_id, tombstone_time, tombstone_id)),
+        "has_more": len(task_rows) > limit or len(tombstone_rows) > limit,
+    })
+
+@router.get("/export")
+async def export_tasks(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream every task of the user as NDJSON or CSV, read through a
+    server-side cursor in TASKS_EXPORT_CHUNK_SIZE partitions.
+    """
+    statement = (
+        select(*(getattr(Task, column) for column in EXPORT_COLUMNS))
+        .where(Task.user_id == current_user.id)
+        .order_by(Task.id)
+    )
+
+    async def body():
+        # Request-scoped sessions are closed before a streamed body runs
+        async with session_scope() as session:
+            header = export_format == "csv"
+            async for rows in stream_partitions(session, statement, settings.TASKS_EXPORT_CHUNK_SIZE):
+                yield export_records(rows, export_format, header=header)
+                header = False
+            if header:
+                yield export_records([], export_format, header=True)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format}"'}
+    )
+
+@router.post("/import")
+async def import_tasks(
+    request: Request,
+    import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user),
+    session: DatabaseSession = Depends(get_session)
+):
+    """
+    Create tasks from an NDJSON or CSV request body, parsed as it streams in
+    and inserted (and committed) TASKS_IMPORT_BATCH_SIZE rows at a time.
+    Invalid records are skipped and reported; earlier batches stay committed
+    if the upload breaks off.
+    """
+    imported = 0
+    failed = 0
+    errors = []
+    pending = []
+
+    async def flush():
+        nonlocal imported
+        if pending:
+            # Stamped right before the commit, not as records were parsed: a
+            # slow upload must not commit rows older than the sync horizon
+            now = datetime.utcnow()
+            for row in pending:
+                row["created_at"] = row["updated_at"] = now
+            await session.execute(insert(Task), pending)
+            await session.commit()
+            imported += len(pending)
+            pending.clear()
+
+    try:
+        async for number, record in iter_records(request.stream(), import_format):
+            error = None
+            if record is None:
+                error = "Malformed record"
+            else:
+                try:
+                    task = TaskCreate.model_validate(import_fields(record))
+                except ValidationError as exc:
+                    error = "; ".join(
+                        f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in exc.errors()
+                    )
+            if error is not None:
+                failed += 1
+                if len(errors) < settings.TASKS_IMPORT_MAX_ERRORS:
+                    errors.append({"record": number, "error": error})
+                continue
+
+            pending.append({**task.dict(), "user_id": current_user.id})
+            if len(pending) >= settings.TASKS_IMPORT_BATCH_SIZE:
+                await flush()
+        await flush()
+    except ImportFormatError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{exc}; {imported} tasks were imported before the error"
+        )
+
+    if imported:
+        task_events.publish(current_user.id, "resync", {})
+    return {"imported": imported, "failed": failed, "errors": errors}
+
+@router.post("/ticket")
+async def create_task_stream_ticket(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Ticket for opening /stream from a browser EventSource. It is valid for
+    TASK_STREAM_TICKET_SECONDS and for nothing but the stream, so the access
+    token never has to appear in a URL.
+    """
+    expires_in = settings.TASK_STREAM_TICKET_SECONDS
+    ticket = create_stream_ticket(decode_token(credentials.credentials), timedelta(seconds=expires_in))
+    return {"ticket": ticket, "expires_in": expires_in}
+
+@router.get("/stream")
+async def stream_task_changes(credentials: StreamCredentials = Depends(get_stream_credentials)):
+    """
+    Server-sent events for the user's task changes: created, updated,
+    completed, deleted, and resync when the client should refetch (bulk
+    changes, or it fell too far behind). A comment line is sent every
+    TASK_STREAM_HEARTBEAT_SECONDS to keep proxies from closing the connection.
+    The stream ends once the access token behind it expires or is revoked.
+    """
+    user_id = credentials.user.id
+
+    async def body():
+        subscription = task_events.subscribe(user_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                event = await subscription.get(timeout=settings.TASK_STREAM_HEARTBEAT_SECONDS)
+                # Usually answered from memory; see TokenRevocationStore
+                if not await stream_still_authorized(credentials):
+                    break
+                if event is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                data = json.dumps(event["data"], separators=(",", ":"))
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+        finally:
+            # Runs when Starlette cancels the body on client disconnect
+            task_events.unsubscribe(user_id, subscription)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/batch", response_model=TaskBatchResult)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: DatabaseSession = Depends(get_session)
+):
+    """
+    Apply many creates, partial updates, completion toggles and deletes in a
+    single transaction, in that order, with one bulk statement per kind.
+    Items pointing at tasks the user does not own are reported as not_found.
+    """
+    size = len(batch.create) + len(batch.update) + len(batch.delete) + len(batch.toggle_complete)
+    if size > settings.TASKS_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.TASKS_MAX_BATCH_SIZE} operations"
+        )
+
+    now = datetime.utcnow()
+    result = TaskBatchResult()
+
+    referenced_ids = {item.id for item in batch.update} | set(batch.delete) | set(batch.toggle_complete)
+    owned_ids = set()
+    if referenced_ids:
+        owned_ids = set((await session.exec(
+            select(Task.id).where(Task.user_id == current_user.id, Task.id.in_(referenced_ids))
+        )).all())
+
+    if batch.create:
+        rows = [
+            {**item.dict(), "user_id": current_user.id, "created_at": now, "updated_at": now}
+            for item in batch.create
+        ]
+        new_ids = (await session.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        )).scalars().all()
+        result.create = [TaskBatchItemResult(id=task_id, status="created") for task_id in new_ids]
+
+    update_rows = []
+    for item in batch.update:
+        if item.id not in owned_ids:
+            result.update.append(TaskBatchItemResult(id=item.id, status="not_found"))
+            continue
+        update_rows.append({**item.dict(exclude_unset=True), "id": item.id, "updated_at": now})
+        result.update.append(TaskBatchItemResult(id=item.id, status="updated"))
+    if update_rows:
+        # ORM bulk UPDATE by primary key (executemany)
+        await session.execute(update(Task), update_rows)
+
+    # Toggling the same task twice in one batch cancels out
+    toggle_counts = Counter(batch.toggle_complete)
+    flipped_ids = [task_id for task_id, count in toggle_counts.items() if task_id in owned_ids and count % 2]
+    if flipped_ids:
+        await session.execute(
+            update(Task)
+            .where(Task.user_id == current_user.id, Task.id.in_(flipped_ids))
+            .values(completed=not_(Task.completed), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    toggled_state = {}
+    if toggle_counts.keys() & owned_ids:
+        toggled_state = dict((await session.execute(
+            select(Task.id, Task.completed).where(Task.id.in_(toggle_counts.keys() & owned_ids))
+        )).all())
+    for task_id in batch.toggle_complete:
+        if task_id in toggled_state:
+            result.toggle_complete.append(
+                TaskBatchItemResult(id=task_id, status="toggled", completed=toggled_state[task_id])
+            )
+        else:
+            result.toggle_complete.append(TaskBatchItemResult(id=task_id, status="not_found"))
+
+    deleted_ids = [task_id for task_id in set(batch.delete) if task_id in owned_ids]
+    if deleted_ids:
+        await session.execute(
+            delete(Task)
+            .where(Task.user_id == current_user.id, Task.id.in_(deleted_ids))
+            .execution_options(synchronize_session=False)
+        )
+    result.delete = [
+        TaskBatchItemResult(id=task_id, status="deleted" if task_id in owned_ids else "not_found")
+        for task_id in batch.delete
+    ]
+
+    await session.commit()
+    # Too many changes to describe one by one; listeners refetch instead
+    task_events.publish(current_user.id, "resync", {})
+    return result
 
 @router.get("/{task_id}", response_model=TaskRead)
 async def read_task(
     task_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: DatabaseSession = Depends(get_session)
 ):
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
     if not task or task.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
+        raise task_not_found()
+
+    etag = make_etag(task.id, task.updated_at)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
         )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return task
 
 @router.put("/{task_id}", response_model=TaskRead)
@@ -65,58 +517,60 @@ async def update_task(
     task_id: int,
     task_update: TaskUpdate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: DatabaseSession = Depends(get_session)
 ):
-    db_task = session.get(Task, task_id)
-    if not db_task or db_task.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
+    # One ownership-scoped UPDATE ... RETURNING instead of get/commit/refresh
     update_data = task_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
+    update_data["updated_at"] = datetime.utcnow()
+    db_task = (await session.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .values(**update_data)
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if db_task is None:
+        raise task_not_found()
 
-    db_task.updated_at = datetime.utcnow()
-    session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    await session.commit()
+    publish_task(current_user.id, "updated", db_task)
     return db_task
 
 @router.delete("/{task_id}")
 async def delete_task(
     task_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: DatabaseSession = Depends(get_session)
 ):
-    db_task = session.get(Task, task_id)
-    if not db_task or db_task.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+    deleted_id = (await session.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if deleted_id is None:
+        raise task_not_found()
 
-    session.delete(db_task)
-    session.commit()
+    await session.commit()
+    task_events.publish(current_user.id, "deleted", {"id": task_id})
     return {"message": "Task deleted successfully"}
 
 @router.patch("/{task_id}/complete")
 async def toggle_task_completion(
     task_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: DatabaseSession = Depends(get_session)
 ):
-    db_task = session.get(Task, task_id)
-    if not db_task or db_task.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+    completed = (await session.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .values(completed=not_(Task.completed), updated_at=datetime.utcnow())
+        .returning(Task.completed)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if completed is None:
+        raise task_not_found()
 
-    db_task.completed = not db_task.completed
-    db_task.updated_at = datetime.utcnow()
-    session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
-    return {"completed": db_task.completed}
\ No newline at end of file
+    await session.commit()
+    task_events.publish(current_user.id, "completed", {"id": task_id, "completed": completed})
+    return {"completed": completed}
@@ -8,11 +8,91 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./todo_app.db")
 
+    # Create tables and apply pending migrations at startup when the schema
+    # is behind; turn off to require `python -m backend.manage init-db`
+    AUTO_MIGRATE: bool = True
+
+    # Connection pool (ignored by in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite performance profile, applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+
     # JWT
     SECRET_KEY: str = os.getenv("SECRET_KEY", "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7")  # Default, replace with your own
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Password hashing executor ("thread" or "process") and its queue bound
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Cache of authenticated users, keyed by token subject
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 300
+
+    # Logout token revocation: Bloom filter sizing, recent-revocation cache,
+    # how often each worker syncs with the shared revoked_token table, and how
+    # far behind the newest revocation it re-reads (late commits, clock skew)
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_CACHE_SIZE: int = 10000
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 2
+    TOKEN_REVOCATION_REBUILD_SECONDS: float = 600
+    TOKEN_REVOCATION_SYNC_SKEW_SECONDS: float = 10
+
+    # Pagination
+    TASKS_DEFAULT_PAGE_SIZE: int = 50
+    TASKS_MAX_PAGE_SIZE: int = 200
+
+    # Maximum number of operations accepted by POST /api/tasks/batch
+    TASKS_MAX_BATCH_SIZE: int = 500
+
+    # Admission control: token buckets (requests per second, burst size) per
+    # client IP and per user, and load shedding past MAX_IN_FLIGHT requests.
+    # RATE_LIMIT_BACKEND is "memory" or "package.module:factory" for a shared store.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_AUTH_IP_RATE: float = 0.5
+    RATE_LIMIT_AUTH_IP_BURST: int = 10
+    RATE_LIMIT_TASKS_IP_RATE: float = 50
+    RATE_LIMIT_TASKS_IP_BURST: int = 100
+    RATE_LIMIT_TASKS_USER_RATE: float = 20
+    RATE_LIMIT_TASKS_USER_BURST: int = 60
+    MAX_IN_FLIGHT: int = 512
+
+    # Request metrics at /metrics and the Server-Timing header
+    METRICS_ENABLED: bool = True
+
+    # Delta sync at /api/tasks/changes
+    TASKS_SYNC_PAGE_SIZE: int = 500
+    # Changes are held back SQLITE_BUSY_TIMEOUT_MS plus this margin, so rows
+    # committed after waiting for the write lock are still delivered
+    TASKS_SYNC_SAFETY_WINDOW_SECONDS: int = 2
+    TASKS_TOMBSTONE_RETENTION_DAYS: int = 30
+    TASKS_TOMBSTONE_COMPACTION_INTERVAL_SECONDS: int = 3600
+
+    # Server-sent change feed at /api/tasks/stream; browsers connect with a
+    # ticket valid for TASK_STREAM_TICKET_SECONDS
+    TASK_STREAM_HEARTBEAT_SECONDS: float = 15
+    TASK_STREAM_TICKET_SECONDS: int = 60
+    TASK_STREAM_QUEUE_SIZE: int = 100
+
+    # Streaming export / import
+    TASKS_EXPORT_CHUNK_SIZE: int = 1000
+    TASKS_IMPORT_BATCH_SIZE: int = 1000
+    TASKS_IMPORT_MAX_ERRORS: int = 100
+
     # CORS
     BACKEND_CORS_ORIGINS: str = os.getenv("BACKEND_CORS_ORIGINS", "http://localhost,http://localhost:3000")
 
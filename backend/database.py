@@ -1,25 +1,232 @@
-from sqlalchemy import create_engine
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, List, Optional, Union
+
+from anyio import to_thread
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .config import settings
 
-# Create database engine
-engine = create_engine(settings.DATABASE_URL)
+# Async drivers per dialect, and the module that has to be importable for each
+ASYNC_DRIVERS = {
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+}
+
+
+def async_database_url(url: str) -> Optional[str]:
+    """
+    Return the async form of a database URL, or None to stay on the sync path.
+
+    A bare dialect (sqlite://, postgresql://) is upgraded to its async driver
+    when that driver is installed; a URL naming a driver explicitly is used as
+    is, so e.g. postgresql+psycopg2:// selects the sync fallback.
+    """
+    parsed = make_url(url)
+    if parsed.drivername in (driver for driver, _ in ASYNC_DRIVERS.values()):
+        return url
+    if parsed.drivername not in ASYNC_DRIVERS:
+        return None
+    driver, module = ASYNC_DRIVERS[parsed.drivername]
+    if importlib.util.find_spec(module) is None:
+        return None
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def sync_database_url(url: str) -> str:
+    """Return the sync form of a database URL for migrations and scripts"""
+    parsed = make_url(url)
+    for dialect, (driver, _) in ASYNC_DRIVERS.items():
+        if parsed.drivername == driver:
+            return parsed.set(drivername=dialect).render_as_string(hide_password=False)
+    return url
+
+
+def engine_options(url: str) -> dict:
+    """Pool settings for create_engine / create_async_engine"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a singleton/static pool without these knobs
+        return {}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if parsed.drivername == "sqlite+aiosqlite":
+        # aiosqlite defaults to NullPool, which would reopen the file and
+        # re-run the pragmas on every request
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+def apply_sqlite_profile(sync_engine: Engine) -> None:
+    """Set the SQLite pragmas on every new DBAPI connection of an engine"""
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            # Negative cache_size is in KiB rather than pages
+            cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        finally:
+            cursor.close()
+
+
+def pool_stats(sync_engine: Engine) -> dict:
+    pool = sync_engine.pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    return stats
+
+
+ASYNC_DATABASE_URL = async_database_url(settings.DATABASE_URL)
+SYNC_DATABASE_URL = sync_database_url(settings.DATABASE_URL)
+
+# Create database engine (used directly by migrations, scripts and the sync fallback)
+engine = create_engine(SYNC_DATABASE_URL, **engine_options(SYNC_DATABASE_URL))
+apply_sqlite_profile(engine)
 
 # Create session maker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=Session, autocommit=False, autoflush=False, bind=engine)
+
+# Async engine serving requests whenever an async driver is available
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal = None
+if ASYNC_DATABASE_URL is not None:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+    apply_sqlite_profile(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
 
 # Base class for models
 Base = declarative_base()
 
-def get_session():
-    session = SessionLocal()
+
+class ThreadedSession:
+    """
+    Async facade over a sync Session for the fallback path. Each blocking call
+    runs in a worker thread, so handlers are written once against the
+    AsyncSession API and never block the event loop on either path.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    def expunge(self, instance) -> None:
+        self.sync_session.expunge(instance)
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    async def exec(self, statement, **kwargs):
+        return await to_thread.run_sync(lambda: self.sync_session.exec(statement, **kwargs))
+
+    async def execute(self, statement, *args, **kwargs):
+        return await to_thread.run_sync(lambda: self.sync_session.execute(statement, *args, **kwargs))
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await to_thread.run_sync(lambda: self.sync_session.scalar(statement, *args, **kwargs))
+
+    async def get(self, entity, ident, **kwargs):
+        return await to_thread.run_sync(lambda: self.sync_session.get(entity, ident, **kwargs))
+
+    async def delete(self, instance) -> None:
+        await to_thread.run_sync(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await to_thread.run_sync(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await to_thread.run_sync(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await to_thread.run_sync(self.sync_session.rollback)
+
+    async def refresh(self, instance) -> None:
+        await to_thread.run_sync(self.sync_session.refresh, instance)
+
+    async def close(self) -> None:
+        await to_thread.run_sync(self.sync_session.close)
+
+
+DatabaseSession = Union[AsyncSession, ThreadedSession]
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[DatabaseSession]:
+    """Open a session outside of FastAPI's dependency system (e.g. for streaming bodies)"""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    session = ThreadedSession(SessionLocal(expire_on_commit=False))
     try:
         yield session
     finally:
-        session.close()
+        await session.close()
+
+
+async def get_session() -> AsyncGenerator[DatabaseSession, None]:
+    async with session_scope() as session:
+        yield session
+
+
+async def stream_partitions(session: DatabaseSession, statement, size: int) -> AsyncIterator[List]:
+    """
+    Yield the rows of a statement in lists of at most `size`, fetched through
+    a server-side cursor so memory stays bounded by one partition.
+    """
+    statement = statement.execution_options(yield_per=size)
+    if isinstance(session, ThreadedSession):
+        result = await session.execute(statement)
+        while True:
+            rows = await to_thread.run_sync(result.fetchmany, size)
+            if not rows:
+                break
+            yield rows
+        return
+
+    result = await session.stream(statement)
+    async for rows in result.partitions(size):
+        yield rows
+
+def database_pool_stats() -> dict:
+    stats = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        stats["async"] = pool_stats(async_engine.sync_engine)
+    return stats
+
+
+async def dispose_engines() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
 
 # Create all tables
 def create_db_and_tables():
-    SQLModel.metadata.create_all(bind=engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(bind=engine)
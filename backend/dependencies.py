@@ -1,35 +1,164 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
-from sqlmodel import Session, select
-from typing import Generator
-from .database import get_session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from sqlmodel import select
+from functools import lru_cache
+from typing import Generator, NamedTuple, Optional
+import time
+from .database import DatabaseSession, get_session, session_scope
 from .models.user import User
 from .config import settings
+from .utils.auth import STREAM_TICKET_SCOPE
+from .utils.cache import LRUTTLCache
+from .utils.revocation import TokenRevocationStore
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
-) -> User:
-    credentials_exception = HTTPException(
+# Resolved users keyed by token subject (email). Entries never outlive the
+# token that loaded them, and are dropped whenever the user row changes.
+user_cache = LRUTTLCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=min(settings.USER_CACHE_TTL_SECONDS, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+)
+
+# Logged-out tokens (see utils/revocation.py)
+token_revocations = TokenRevocationStore(
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    cache_size=settings.TOKEN_REVOCATION_CACHE_SIZE,
+    rebuild_seconds=settings.TOKEN_REVOCATION_REBUILD_SECONDS,
+    skew_seconds=settings.TOKEN_REVOCATION_SYNC_SKEW_SECONDS,
+)
+
+# Changed users are evicted once their transaction ends. Mapper events fire
+# at flush, before the commit, and a concurrent request could re-cache the
+# old row in between; evicting after commit (or rollback) closes that gap.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target: User) -> None:
+    # An email change leaves the old subject cached as well
+    emails = {target.email, *inspect(target).attrs.email.history.deleted}
+    session = object_session(target)
+    if session is None:
+        for email in emails:
+            user_cache.invalidate(email)
+        return
+    session.info.setdefault("changed_user_emails", set()).update(emails)
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_changed_users(session: Session) -> None:
+    for email in session.info.pop("changed_user_emails", ()):
+        user_cache.invalidate(email)
+
+def credentials_error() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+def decode_token(token: str, scope: Optional[str] = None) -> dict:
+    """
+    Verify a JWT's signature and expiry, raising 401 when it is not valid.
+    Access tokens carry no scope; stream tickets are only accepted where
+    their scope is asked for, and never as access tokens.
+    """
+    from jose import JWTError, jwt  # imported on first use, off the startup path
+
     try:
         payload = jwt.decode(
-            credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
+        raise credentials_error()
+    if payload.get("sub") is None or payload.get("scope") != scope:
+        raise credentials_error()
+    return payload
+
+@lru_cache(maxsize=4096)
+def token_subject(token: Optional[str]) -> Optional[str]:
+    """The user a bearer token was issued to, for rate limiting; None if it is not valid"""
+    if token is None:
+        return None
+    try:
+        return decode_token(token)["sub"]
+    except HTTPException:
+        return None
+
+async def authenticate_token(token: str, session: DatabaseSession) -> User:
+    """Resolve a bearer JWT to its user, raising 401 when it is not valid"""
+    return await authenticate_payload(decode_token(token), session)
+
+async def authenticate_payload(payload: dict, session: DatabaseSession) -> User:
+    """Resolve verified token claims to their user, raising 401 when revoked or unknown"""
+    credentials_exception = credentials_error()
+    email: str = payload["sub"]
+
+    # Checked before the user cache: revocation is per token, the cache per
+    # user. Tokens issued before jti was added cannot be revoked.
+    jti = payload.get("jti")
+    if jti is not None and await token_revocations.is_revoked(jti, session):
         raise credentials_exception
 
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+
+    user = (await session.exec(select(User).where(User.email == email))).first()
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+
+    # Detach so the shared instance is never expired or refreshed by a
+    # later commit in some request's session
+    session.expunge(user)
+    user_cache.set(email, user, expires_at=payload.get("exp"))
+    return user
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: DatabaseSession = Depends(get_session)
+) -> User:
+    return await authenticate_token(credentials.credentials, session)
+
+class StreamCredentials(NamedTuple):
+    """Who an open change stream belongs to, and what keeps it authorized"""
+    user: User
+    jti: Optional[str]
+    expires_at: float
+
+async def get_stream_credentials(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    ticket: Optional[str] = Query(None),
+    session: DatabaseSession = Depends(get_session)
+) -> StreamCredentials:
+    """
+    Authenticate the change stream with the usual bearer header or, because
+    browser EventSource cannot send headers, a short-lived ticket from
+    POST /api/tasks/ticket in the query string. The access token itself never
+    goes in a URL, where access logs and browser history would keep it.
+    """
+    if credentials is not None:
+        payload = decode_token(credentials.credentials)
+    elif ticket is not None:
+        payload = decode_token(ticket, scope=STREAM_TICKET_SCOPE)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = await authenticate_payload(payload, session)
+    # A ticket shares its access token's jti and records that token's expiry
+    return StreamCredentials(user, payload.get("jti"), payload.get("token_exp", payload["exp"]))
+
+async def stream_still_authorized(credentials: StreamCredentials) -> bool:
+    """Re-checked while a stream is open: its access token must be unexpired and not revoked"""
+    if time.time() >= credentials.expires_at:
+        return False
+    if credentials.jti is None:
+        return True
+    async with session_scope() as session:
+        return not await token_revocations.is_revoked(credentials.jti, session)
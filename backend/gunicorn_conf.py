@@ -0,0 +1,15 @@
+"""
+gunicorn settings used by `start_backend.py --prod` when gunicorn is installed.
+
+The app is preloaded in the master, so workers inherit its engines. Pooled
+connections must not be shared across processes: each worker drops the
+inherited pool (without closing the parent's sockets) and opens its own.
+"""
+
+
+def post_fork(server, worker):
+    from backend.database import async_engine, engine
+
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
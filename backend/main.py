@@ -1,20 +1,105 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .config import settings
 from .api import auth, tasks
-from .database import engine
-from .models import user, task  # Import models to create tables
+from .database import async_engine, database_pool_stats, dispose_engines, engine
+from .dependencies import token_revocations, token_subject, user_cache
+from .utils.ratelimit import AdmissionController, Budget, RateLimitMiddleware, Route, load_backend
+from .utils.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, MetricsRegistry, instrument_engine
+from .utils.serialization import FastJSONResponse
+from .utils.password import password_pool_stats, shutdown_password_executor
+from .utils.revocation import sync_revocations_periodically
+from .utils.startup import StartupTimer, warm_up
+from .utils.sync import compact_tombstones_periodically
+from .migrations import ensure_schema
+
+# Reported next to uvicorn's own startup messages
+logger = logging.getLogger("uvicorn.error")
+
+startup_timer = StartupTimer(_import_started)
+startup_timer.mark("imports")
+
+background_tasks = set()
+
+def start_background_task(coroutine) -> None:
+    background_tasks.add(asyncio.create_task(coroutine))
+
+async def stop_background_tasks():
+    for background_task in background_tasks:
+        background_task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing touches the database at import time; the schema is checked
+    # (one version query) and, if behind and AUTO_MIGRATE is on, upgraded
+    # here. Deploys can run `python -m backend.manage init-db` beforehand.
+    with startup_timer.phase("schema"):
+        await to_thread.run_sync(lambda: ensure_schema(engine, migrate=settings.AUTO_MIGRATE))
+    with startup_timer.phase("revocations"):
+        # Load every live revocation before the first request is authenticated
+        await token_revocations.sync(engine)
+    with startup_timer.phase("background tasks"):
+        start_background_task(compact_tombstones_periodically(
+            engine,
+            timedelta(days=settings.TASKS_TOMBSTONE_RETENTION_DAYS),
+            settings.TASKS_TOMBSTONE_COMPACTION_INTERVAL_SECONDS,
+        ))
+        start_background_task(sync_revocations_periodically(
+            token_revocations, engine, settings.TOKEN_REVOCATION_SYNC_SECONDS
+        ))
+        # jose and passlib load after startup, before the first login needs them
+        start_background_task(to_thread.run_sync(warm_up))
+    logger.info(startup_timer.summary())
 
-# Create database tables
-user.User.metadata.create_all(bind=engine)
-task.Task.metadata.create_all(bind=engine)
+    yield
+
+    await stop_background_tasks()
+    shutdown_password_executor()
+    await dispose_engines()
 
 # Create FastAPI app
 app = FastAPI(
     title="Todo App API",
     description="API for the Todo App - Phase II: Full-Stack Web Application",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+
+# Admission control. Added before CORS so 429/503 answers still carry CORS
+# headers and the browser can read them.
+admission = AdmissionController(
+    backend=load_backend(settings.RATE_LIMIT_BACKEND, settings.RATE_LIMIT_MAX_KEYS),
+    routes=[
+        # Every login/register is a bcrypt call, so the IP budget is tight
+        Route("/api/auth/", Budget(settings.RATE_LIMIT_AUTH_IP_RATE, settings.RATE_LIMIT_AUTH_IP_BURST), None),
+        # A dashboard load costs three requests (first page, stats, stream
+        # ticket) and more pages are fetched on demand, well inside the
+        # per-user budget
+        Route(
+            "/api/tasks/",
+            Budget(settings.RATE_LIMIT_TASKS_IP_RATE, settings.RATE_LIMIT_TASKS_IP_BURST),
+            Budget(settings.RATE_LIMIT_TASKS_USER_RATE, settings.RATE_LIMIT_TASKS_USER_BURST),
+        ),
+    ],
+    max_in_flight=settings.MAX_IN_FLIGHT,
+    user_key=token_subject,
+    exempt=("/health", "/metrics", "/api/tasks/stream"),
 )
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, controller=admission)
 
 # CORS middleware
 app.add_middleware(
@@ -25,14 +110,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics, served at /metrics. Added last so it wraps CORS and sees
+# every response.
+metrics = MetricsRegistry()
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
 
+startup_timer.mark("app")
+
 @app.get("/")
 def read_root():
     return {"message": "Todo App API - Phase II", "version": "2.0.0"}
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "message": "API is running"}
\ No newline at end of file
+    return {"status": "healthy", "message": "API is running"}
+
+@app.get("/health/stats")
+def health_stats():
+    return {
+        "database_pool": database_pool_stats(),
+        "user_cache": user_cache.stats(),
+        "token_revocation": token_revocations.stats(),
+        "password_pool": password_pool_stats(),
+        "admission": admission.stats(),
+        "task_stream": tasks.task_events.stats(),
+        "startup_ms": startup_timer.as_dict(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,63 @@
+"""
+Maintenance commands for the backend.
+
+Usage (from the repository root):
+    python -m backend.manage init-db        (alias: migrate)
+    python -m backend.manage rebuild-stats [--user-id ID]
+    python -m backend.manage compact-tombstones [--days N]
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from .config import settings
+from .database import engine
+from .migrations import current_version, ensure_schema
+from .models import task, user  # noqa: F401  (registers the tables)
+from .utils.sync import compact_tombstones
+from .utils.task_stats import rebuild_task_stats
+
+
+def init_db(args) -> None:
+    applied = ensure_schema(engine)
+    if applied:
+        print(f"Applied migrations: {', '.join(map(str, applied))}")
+    print(f"Schema version: {current_version(engine)}")
+
+
+def rebuild_stats(args) -> None:
+    with engine.begin() as connection:
+        rows = rebuild_task_stats(connection, user_id=args.user_id)
+    print(f"Rebuilt task counters for {rows} user(s)")
+
+
+def compact(args) -> None:
+    with engine.begin() as connection:
+        removed = compact_tombstones(connection, datetime.utcnow() - timedelta(days=args.days))
+    print(f"Removed {removed} tombstone(s) older than {args.days} day(s)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "init-db", aliases=["migrate"], help="create tables and apply pending migrations, if any"
+    ).set_defaults(func=init_db)
+
+    rebuild = commands.add_parser("rebuild-stats", help="recompute per-user task counters")
+    rebuild.add_argument("--user-id", type=int, default=None, help="only rebuild this user")
+    rebuild.set_defaults(func=rebuild_stats)
+
+    compaction = commands.add_parser("compact-tombstones", help="drop delete markers past retention")
+    compaction.add_argument(
+        "--days", type=int, default=settings.TASKS_TOMBSTONE_RETENTION_DAYS,
+        help="keep tombstones younger than this many days"
+    )
+    compaction.set_defaults(func=compact)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
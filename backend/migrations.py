@@ -0,0 +1,227 @@
+"""
+Versioned schema migrations.
+
+SQLModel's create_all only creates missing tables; it never alters a table
+that already exists. Each migration below is applied once, in order, and
+recorded in the schema_version table so existing databases catch up with
+the models.
+
+At startup the app only compares the recorded version with the latest one
+(see ensure_schema); the work itself can be done ahead of time with:
+    python -m backend.manage init-db
+"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy import Column, Index, MetaData, Table, func, text
+from sqlmodel import Field, SQLModel, select
+
+from .models import user
+from .models.task import TaskStats, TaskTombstone
+from .utils import sync
+from .utils.task_stats import POSTGRES_TRIGGERS, SQLITE_TRIGGERS, rebuild_task_stats
+
+
+class SchemaVersion(SQLModel, table=True):
+    __tablename__ = "schema_version"
+
+    version: int = Field(primary_key=True)
+    description: str
+    applied_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """Register a migration function under a version number"""
+    def decorator(func: Callable[[Connection], None]):
+        MIGRATIONS.append(Migration(version, description, func))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return func
+    return decorator
+
+
+def _index(name: str, table_name: str, *columns: str) -> Index:
+    """
+    A named index frozen at the point a migration introduces it. It is built
+    on a detached copy of the table, so it neither follows later changes to
+    the models nor gets attached to their metadata.
+    """
+    table = Table(table_name, MetaData(), *(Column(column) for column in columns))
+    return Index(name, *(table.c[column] for column in columns))
+
+
+@migration(1, "Composite indexes on task for per-user filters and ordering")
+def _task_composite_indexes(connection: Connection) -> None:
+    indexes = [
+        _index("ix_task_user_id_completed", "task", "user_id", "completed"),
+        _index("ix_task_user_id_priority", "task", "user_id", "priority"),
+        _index("ix_task_user_id_due_date", "task", "user_id", "due_date"),
+        _index("ix_task_user_id_created_at_id", "task", "user_id", "created_at", "id"),
+    ]
+    for index in indexes:
+        index.create(bind=connection, checkfirst=True)
+
+
+@migration(2, "Full-text index on task title and description")
+def _task_full_text_index(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = [
+            """CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+                title, description, content='task', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )""",
+            """CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task BEGIN
+                INSERT INTO task_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END""",
+            """CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task BEGIN
+                INSERT INTO task_fts(task_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END""",
+            """CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF title, description ON task BEGIN
+                INSERT INTO task_fts(task_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO task_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END""",
+            # Index rows that existed before the FTS table
+            "INSERT INTO task_fts(task_fts) VALUES ('rebuild')",
+        ]
+    elif dialect == "postgresql":
+        statements = [
+            """ALTER TABLE task ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+                ) STORED""",
+            "CREATE INDEX IF NOT EXISTS ix_task_search_vector ON task USING GIN (search_vector)",
+        ]
+    else:
+        # Other backends keep the LIKE fallback in utils/search.py
+        statements = []
+
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+@migration(3, "Per-user task counters maintained by triggers")
+def _task_stats_counters(connection: Connection) -> None:
+    TaskStats.__table__.create(bind=connection, checkfirst=True)
+    # Overdue counts are a range scan over (user_id, completed, due_date)
+    _index(
+        "ix_task_user_id_completed_due_date", "task", "user_id", "completed", "due_date"
+    ).create(bind=connection, checkfirst=True)
+
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_TRIGGERS
+    elif dialect == "postgresql":
+        statements = POSTGRES_TRIGGERS
+    else:
+        statements = []
+    for statement in statements:
+        connection.execute(text(statement))
+
+    rebuild_task_stats(connection)
+
+
+@migration(4, "Task tombstones and (user_id, updated_at) index for delta sync")
+def _task_tombstones(connection: Connection) -> None:
+    TaskTombstone.__table__.create(bind=connection, checkfirst=True)
+    indexes = [
+        _index("ix_task_user_id_updated_at_id", "task", "user_id", "updated_at", "id"),
+        _index(
+            "ix_task_tombstone_user_id_deleted_at_id", "task_tombstone", "user_id", "deleted_at", "id"
+        ),
+    ]
+    for index in indexes:
+        index.create(bind=connection, checkfirst=True)
+
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = sync.SQLITE_TRIGGERS
+    elif dialect == "postgresql":
+        statements = sync.POSTGRES_TRIGGERS
+    else:
+        statements = []
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+@migration(5, "Shared table of revoked access tokens")
+def _revoked_tokens(connection: Connection) -> None:
+    user.RevokedToken.__table__.create(bind=connection, checkfirst=True)
+
+
+@migration(6, "Index revoked tokens by revocation time for incremental sync")
+def _revoked_token_revoked_at_index(connection: Connection) -> None:
+    _index(
+        "ix_revoked_token_revoked_at", "revoked_token", "revoked_at"
+    ).create(bind=connection, checkfirst=True)
+
+
+@migration(7, "Drop the (user_id, completed) task index, a prefix of (user_id, completed, due_date)")
+def _drop_task_user_id_completed_index(connection: Connection) -> None:
+    _index("ix_task_user_id_completed", "task", "user_id", "completed").drop(bind=connection, checkfirst=True)
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1].version
+
+
+def current_version(engine: Engine) -> int:
+    """Return the highest applied migration version, 0 for a new database"""
+    with engine.connect() as connection:
+        if not engine.dialect.has_table(connection, SchemaVersion.__tablename__):
+            return 0
+        version = connection.execute(select(func.max(SchemaVersion.__table__.c.version))).scalar()
+    return version or 0
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply every pending migration in its own transaction"""
+    applied = []
+    SchemaVersion.__table__.create(bind=engine, checkfirst=True)
+    version = current_version(engine)
+    for item in MIGRATIONS:
+        if item.version <= version:
+            continue
+        with engine.begin() as connection:
+            item.apply(connection)
+            connection.execute(
+                SchemaVersion.__table__.insert().values(
+                    version=item.version,
+                    description=item.description,
+                    applied_at=datetime.utcnow(),
+                )
+            )
+        applied.append(item.version)
+    return applied
+
+
+def ensure_schema(engine: Engine, migrate: bool = True) -> List[int]:
+    """
+    Make sure the database is at the latest schema version. When it already
+    is (the normal case) this costs one version query; otherwise tables are
+    created and pending migrations applied, or, with migrate=False, an error
+    is raised so the deploy can run `python -m backend.manage init-db`.
+    """
+    version = current_version(engine)
+    if version >= latest_version():
+        return []
+    if not migrate:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {latest_version()}; "
+            "run `python -m backend.manage init-db`"
+        )
+    SQLModel.metadata.create_all(bind=engine)
+    return run_migrations(engine)
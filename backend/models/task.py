@@ -1,5 +1,6 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -16,6 +17,18 @@ class TaskBase(SQLModel):
     due_date: Optional[datetime] = Field(default=None)
 
 class Task(TaskBase, table=True):
+    # Composite indexes matching the filters and sort order used by read_tasks.
+    # (user_id, completed) filters use the leftmost prefix of the
+    # (user_id, completed, due_date) index.
+    # Existing databases pick these up through backend/migrations.py.
+    __table_args__ = (
+        Index("ix_task_user_id_priority", "user_id", "priority"),
+        Index("ix_task_user_id_due_date", "user_id", "due_date"),
+        Index("ix_task_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_task_user_id_completed_due_date", "user_id", "completed", "due_date"),
+        Index("ix_task_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -33,9 +46,67 @@ class TaskRead(TaskBase):
     created_at: datetime
     updated_at: datetime
 
+class TaskPage(SQLModel):
+    items: List[TaskRead]
+    next_cursor: Optional[str] = None
+
 class TaskUpdate(SQLModel):
     title: Optional[str] = None
     description: Optional[str] = None
     completed: Optional[bool] = None
     priority: Optional[PriorityEnum] = None
-    due_date: Optional[datetime] = None
\ No newline at end of file
+    due_date: Optional[datetime] = None
+
+class TaskStats(SQLModel, table=True):
+    """Per-user counters kept in sync with task by database triggers"""
+    __tablename__ = "task_stats"
+
+    user_id: int = Field(primary_key=True, foreign_key="user.id")
+    total: int = Field(default=0)
+    completed: int = Field(default=0)
+    high_priority: int = Field(default=0)
+
+class TaskTombstone(SQLModel, table=True):
+    """Record of a deleted task, written by a trigger, for delta sync"""
+    __tablename__ = "task_tombstone"
+    __table_args__ = (
+        Index("ix_task_tombstone_user_id_deleted_at_id", "user_id", "deleted_at", "id"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+    task_id: int
+    user_id: int
+    deleted_at: datetime
+
+class TaskChanges(SQLModel):
+    tasks: List[TaskRead]
+    deleted: List[int]
+    next_token: str
+    has_more: bool
+
+class TaskStatsRead(SQLModel):
+    total: int
+    completed: int
+    pending: int
+    high_priority: int
+    overdue: int
+
+class TaskBatchUpdate(TaskUpdate):
+    id: int
+
+class TaskBatchRequest(SQLModel):
+    create: List[TaskCreate] = []
+    update: List[TaskBatchUpdate] = []
+    delete: List[int] = []
+    toggle_complete: List[int] = []
+
+class TaskBatchItemResult(SQLModel):
+    id: Optional[int] = None
+    status: str
+    completed: Optional[bool] = None
+
+class TaskBatchResult(SQLModel):
+    create: List[TaskBatchItemResult] = []
+    update: List[TaskBatchItemResult] = []
+    delete: List[TaskBatchItemResult] = []
+    toggle_complete: List[TaskBatchItemResult] = []
@@ -1,11 +1,8 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 from datetime import datetime
-from passlib.context import CryptContext
 from enum import Enum
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from ..utils.password import verify_password
 
 class UserBase(SQLModel):
     email: str = Field(unique=True, index=True)
@@ -21,7 +18,7 @@ class User(UserBase, table=True):
     tasks: List["Task"] = Relationship(back_populates="user")
 
     def verify_password(self, password: str) -> bool:
-        return pwd_context.verify(password, self.password_hash)
+        return verify_password(password, self.password_hash)
 
 class UserCreate(UserBase):
     password: str
@@ -37,4 +34,15 @@ class UserUpdate(SQLModel):
 
 class UserLogin(SQLModel):
     email: str
-    password: str
\ No newline at end of file
+    password: str
+
+class RevokedToken(SQLModel, table=True):
+    """Access tokens revoked by logout, kept until they would have expired"""
+    __tablename__ = "revoked_token"
+    # Ids are never reused; workers sync by revoked_at (see utils/revocation.py)
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    jti: str = Field(unique=True, index=True)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
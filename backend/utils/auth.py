@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from uuid import uuid4
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .password import verify_password
@@ -12,17 +12,44 @@ from ..database import get_session
 # Security scheme for API docs
 security = HTTPBearer()
 
+# Scope claim of tickets that only open the task change stream
+STREAM_TICKET_SCOPE = "task-stream"
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt  # imported on first use, off the startup path
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    # jti identifies this token so logout can revoke it alone
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_stream_ticket(access_payload: dict, expires_delta: timedelta) -> str:
+    """
+    Short-lived token that can only open the task change stream, for use in
+    an EventSource URL in place of the access token. It shares the access
+    token's jti, so revoking that token revokes the ticket and the stream.
+    """
+    from jose import jwt
+
+    token_expire = datetime.utcfromtimestamp(access_payload["exp"])
+    to_encode = {
+        "sub": access_payload["sub"],
+        "scope": STREAM_TICKET_SCOPE,
+        "exp": min(datetime.utcnow() + expires_delta, token_expire),
+        "token_exp": access_payload["exp"],
+    }
+    if access_payload.get("jti") is not None:
+        to_encode["jti"] = access_payload["jti"]
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
 def verify_token(token: str):
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
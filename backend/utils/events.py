@@ -0,0 +1,74 @@
+import asyncio
+import itertools
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+
+class Subscription:
+    """
+    One listener's bounded queue. A listener that falls more than `maxsize`
+    events behind does not slow publishers down: its backlog is dropped and
+    replaced by a single "resync" event telling it to refetch.
+    """
+
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait({"id": event["id"], "type": "resync", "data": {}})
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class TaskEventBroker:
+    """
+    In-process pub/sub of task changes, fanned out per user. Handlers
+    publish after their transaction commits; publishing never blocks.
+    Events only reach listeners connected to the same worker process.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._ids = itertools.count(1)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id: int, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def has_subscribers(self, user_id: int) -> bool:
+        return bool(self._subscribers.get(user_id))
+
+    def publish(self, user_id: int, event_type: str, data: Dict[str, Any]) -> None:
+        subscribers = self._subscribers.get(user_id)
+        if not subscribers:
+            return
+        event = {"id": next(self._ids), "type": event_type, "data": data}
+        for subscription in list(subscribers):
+            subscription.offer(event)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self._subscribers),
+            "subscriptions": sum(len(subs) for subs in self._subscribers.values()),
+        }
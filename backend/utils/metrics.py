@@ -0,0 +1,180 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Latency buckets in seconds, Prometheus' defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Label for requests no route matched, so scanners cannot blow up cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+
+class QueryStats:
+    """Queries issued and time spent in the database by one request"""
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set per request by MetricsMiddleware. The object is mutated in place, so
+# queries run from worker threads or SQLAlchemy's async greenlets (which see
+# a copy of the context) still add to the request that issued them.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """Count queries and their duration against the current request"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany):
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += time.perf_counter() - context._query_started
+
+
+class RouteMetrics:
+    __slots__ = ("buckets", "duration_sum", "count", "statuses", "queries", "query_seconds")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.duration_sum = 0.0
+        self.count = 0
+        self.statuses: Dict[int, int] = {}
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+class MetricsRegistry:
+    """
+    Request metrics keyed by (method, route template). Updated only from the
+    event loop thread, so no locking is needed on the hot path.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+
+    def observe(self, method: str, route: str, status: int, duration: float, queries: QueryStats) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        # Buckets are stored non-cumulative and summed when rendered
+        metrics.buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        metrics.duration_sum += duration
+        metrics.count += 1
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.queries += queries.count
+        metrics.query_seconds += queries.seconds
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requests served, by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        routes = sorted(self.routes.items())
+        for (method, route), metrics in routes:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}'
+                )
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency, by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in routes:
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.duration_sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+        lines += [
+            "# HELP db_queries_total Database queries issued, by route.",
+            "# TYPE db_queries_total counter",
+        ]
+        for (method, route), metrics in routes:
+            lines.append(f'db_queries_total{{method="{method}",route="{route}"}} {metrics.queries}')
+        lines += [
+            "# HELP db_query_duration_seconds_total Time spent in database queries, by route.",
+            "# TYPE db_query_duration_seconds_total counter",
+        ]
+        for (method, route), metrics in routes:
+            lines.append(
+                f'db_query_duration_seconds_total{{method="{method}",route="{route}"}} {metrics.query_seconds}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop) recording latency,
+    status and query counts per route, and adding a Server-Timing header:
+    `db;dur=<ms>;desc="<n> queries", app;dur=<ms>` measured up to the
+    moment the response starts.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        started = time.perf_counter()
+        queries = QueryStats()
+        reset = current_query_stats.set(queries)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - started
+                timing = (
+                    f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} queries", '
+                    f"app;dur={elapsed * 1000:.2f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            registry.in_flight -= 1
+            current_query_stats.reset(reset)
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            registry.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started,
+                queries,
+            )
@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple, Union
+
+SortValue = Union[datetime, float]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(sort_value: SortValue, task_id: int) -> str:
+    """Build an opaque cursor from the sort key of the last row on a page"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, task_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[SortValue, int]:
+    """
+    Turn a cursor produced by encode_cursor back into (sort value, id).
+    The sort value is a datetime for created_at ordering and a float for
+    search-rank ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(sort_value, str):
+            sort_value = datetime.fromisoformat(sort_value)
+        elif not isinstance(sort_value, (int, float)) or isinstance(sort_value, bool):
+            raise TypeError("Unsupported cursor sort value")
+        return sort_value, int(task_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor") from exc
@@ -1,9 +1,80 @@
-from passlib.context import CryptContext
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from ..config import settings
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    # passlib is imported on first use so it stays off the startup path
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context().hash(password)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when too much password work is already queued"""
+
+
+# bcrypt is deliberately slow (~250 ms); running it inline in an async
+# handler stalls the event loop. Work goes to a dedicated executor instead,
+# and callers are turned away once PASSWORD_HASH_MAX_PENDING jobs are queued
+# or running so login bursts cannot starve the rest of the API.
+_executor: Optional[Executor] = None
+_pending = 0
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _executor
+
+
+async def _run(func, *args):
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordPoolBusy("Password hashing queue is full")
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run(get_password_hash, password)
+
+
+def password_pool_stats() -> dict:
+    return {
+        "executor": settings.PASSWORD_HASH_EXECUTOR,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "pending": _pending,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+    }
+
+
+def shutdown_password_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
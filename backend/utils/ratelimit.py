@@ -0,0 +1,193 @@
+import importlib
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+
+class Budget(NamedTuple):
+    """Token bucket: `rate` requests per second on average, bursts of `burst`"""
+    rate: float
+    burst: int
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(self, key: str, budget: Budget) -> float:
+        """Take one token; return 0 when allowed, else seconds until one is available"""
+
+
+class MemoryRateLimitBackend:
+    """
+    Per-process token buckets. Only used from the event loop thread, so no
+    locking. At most `max_keys` buckets are kept; the least recently used one
+    is dropped first, which at worst hands that client a fresh full bucket.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str, budget: Budget) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (budget.burst, now))
+        tokens = min(budget.burst, tokens + (now - updated) * budget.rate)
+        if tokens >= 1:
+            retry_after = 0.0
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / budget.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets), "max_keys": self.max_keys}
+
+
+def load_backend(name: str, max_keys: int) -> RateLimitBackend:
+    """
+    "memory" for per-process buckets, or "package.module:factory" for a
+    shared store (e.g. Redis). The factory is called with max_keys.
+    """
+    if name == "memory":
+        return MemoryRateLimitBackend(max_keys)
+    module, _, attribute = name.partition(":")
+    return getattr(importlib.import_module(module), attribute)(max_keys=max_keys)
+
+
+class Route(NamedTuple):
+    """Budgets for paths under `prefix`, per client IP and per signed-in user"""
+    prefix: str
+    per_ip: Optional[Budget]
+    per_user: Optional[Budget]
+
+
+class AdmissionController:
+    """
+    Admission control in front of the API: configuration, in-flight count
+    and counters, shared by RateLimitMiddleware and /health/stats.
+
+    1. Load shedding: once `max_in_flight` requests are being served, new ones
+       get 503 with Retry-After instead of queueing behind them.
+    2. Rate limiting: the first matching Route's token buckets for the client
+       IP and, when the request carries a valid token, for the user. An empty
+       bucket gets 429 with Retry-After.
+
+    Paths in `exempt` (health checks, metrics, the long-lived change stream)
+    and CORS preflights skip both.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        routes: Sequence[Route],
+        max_in_flight: int,
+        user_key: Callable[[Optional[str]], Optional[str]],
+        exempt: Sequence[str] = (),
+    ):
+        self.backend = backend
+        self.routes = routes
+        self.max_in_flight = max_in_flight
+        self.user_key = user_key
+        self.exempt = tuple(exempt)
+        self.in_flight = 0
+        self.shed = 0
+        self.limited: Dict[str, int] = {}
+
+    def skips(self, scope) -> bool:
+        return scope["method"] == "OPTIONS" or scope["path"].startswith(self.exempt)
+
+    async def check_budgets(self, scope) -> float:
+        """Take a token from each applicable bucket; seconds to wait if one is empty"""
+        path = scope["path"]
+        for route in self.routes:
+            if not path.startswith(route.prefix):
+                continue
+            if route.per_ip is not None:
+                client = scope.get("client")
+                ip = client[0] if client else "unknown"
+                retry_after = await self.backend.acquire(f"ip:{route.prefix}:{ip}", route.per_ip)
+                if retry_after:
+                    self.count(route.prefix, "ip")
+                    return retry_after
+            if route.per_user is not None:
+                user = self.user_key(bearer_token(scope))
+                if user is not None:
+                    retry_after = await self.backend.acquire(f"user:{route.prefix}:{user}", route.per_user)
+                    if retry_after:
+                        self.count(route.prefix, "user")
+                        return retry_after
+            return 0.0
+        return 0.0
+
+    def count(self, prefix: str, scope_name: str) -> None:
+        key = f"{prefix} {scope_name}"
+        self.limited[key] = self.limited.get(key, 0) + 1
+
+    def stats(self) -> dict:
+        stats = {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "shed": self.shed,
+            "limited": dict(self.limited),
+        }
+        if hasattr(self.backend, "stats"):
+            stats["backend"] = self.backend.stats()
+        return stats
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware applying an AdmissionController"""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        controller = self.controller
+        if scope["type"] != "http" or controller.skips(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if controller.in_flight >= controller.max_in_flight:
+            controller.shed += 1
+            await reject(send, 503, "Server is busy, please retry shortly", 1)
+            return
+
+        retry_after = await controller.check_budgets(scope)
+        if retry_after:
+            await reject(send, 429, "Too many requests", retry_after)
+            return
+
+        controller.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.in_flight -= 1
+
+
+def bearer_token(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token
+            return None
+    return None
+
+
+async def reject(send: Callable[[dict], Awaitable[None]], status: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
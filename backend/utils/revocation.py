@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import anyio
+from anyio import to_thread
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Engine
+
+from ..models.user import RevokedToken
+from .cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size set membership with no false negatives and a bounded false
+    positive rate. Positions come from double hashing one blake2b digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class TokenRevocationStore:
+    """
+    Revoked token ids (JWT `jti`), checked on every authenticated request.
+
+    - The revoked_token table is the shared record all workers agree on; rows
+      carry the token's expiry and are purged once it passes.
+    - A Bloom filter over every live revoked id answers the common case, a
+      token that was never revoked, without I/O.
+    - An expiring in-memory set holds recent revocations, so a bloom hit for a
+      revoked token is usually settled without I/O too; only bloom false
+      positives and entries evicted from the set cost a primary-key lookup.
+
+    sync() pulls revocations made by other workers into the filter every
+    TOKEN_REVOCATION_SYNC_SECONDS (the window in which another worker may
+    still accept a just-revoked token). It reads by revoked_at rather than
+    id: ids are not handed out in commit order, so a lower id can commit
+    after a higher one was seen. Each pass re-reads `skew_seconds` behind the
+    newest revoked_at seen, which absorbs late commits and clock differences
+    between workers; rows are keyed by jti, so reading one twice is harmless.
+    Every rebuild_seconds it instead purges expired rows and rebuilds the
+    filter so expired ids stop occupying it.
+    """
+
+    def __init__(
+        self, capacity: int, error_rate: float, cache_size: int, rebuild_seconds: float,
+        skew_seconds: float = 10
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_seconds = rebuild_seconds
+        self.skew = timedelta(seconds=skew_seconds)
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.recent = LRUTTLCache(maxsize=cache_size, ttl=math.inf)
+        self.last_seen: Optional[datetime] = None
+        # jti -> revoked_at of rows inside the re-read window, so overlapping
+        # passes do not add them again
+        self._window: Dict[str, datetime] = {}
+        self.next_rebuild = 0.0
+        self._revoked_during_rebuild: Optional[List[str]] = None
+        self.bloom_negatives = 0
+        self.lookups = 0
+
+    def remember(self, jti: str, expires_at: float) -> None:
+        self.bloom.add(jti)
+        if self._revoked_during_rebuild is not None:
+            self._revoked_during_rebuild.append(jti)
+        self.recent.set(jti, True, expires_at=expires_at)
+
+    def might_be_revoked(self, jti: str) -> Optional[bool]:
+        """False or True when answered from memory, None when the table must decide"""
+        if jti not in self.bloom:
+            self.bloom_negatives += 1
+            return False
+        if self.recent.get(jti):
+            return True
+        return None
+
+    async def is_revoked(self, jti: str, session) -> bool:
+        answer = self.might_be_revoked(jti)
+        if answer is not None:
+            return answer
+        self.lookups += 1
+        expires_at = (await session.execute(
+            select(RevokedToken.expires_at).where(RevokedToken.jti == jti)
+        )).scalar_one_or_none()
+        if expires_at is None or expires_at <= datetime.utcnow():
+            return False
+        self.recent.set(jti, True, expires_at=calendar_timestamp(expires_at))
+        return True
+
+    async def revoke(self, jti: str, expires_at: datetime, session) -> None:
+        session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            await session.commit()
+        except IntegrityError:
+            # Already revoked (e.g. a repeated logout)
+            await session.rollback()
+        self.remember(jti, calendar_timestamp(expires_at))
+
+    async def sync(self, engine: Engine) -> None:
+        """
+        Load revocations recorded since the last sync (by any worker). Every
+        TOKEN_REVOCATION_REBUILD_SECONDS expired rows are purged and the
+        filter is rebuilt from the live rows instead, so expired ids drop out
+        of it.
+        """
+        rebuild = time.monotonic() >= self.next_rebuild
+        since = None if rebuild or self.last_seen is None else self.last_seen - self.skew
+        if rebuild:
+            self._revoked_during_rebuild = []
+        try:
+            started, rows = await to_thread.run_sync(self._load, engine, since, rebuild)
+        except BaseException:
+            self._revoked_during_rebuild = None
+            raise
+
+        if rebuild:
+            bloom = BloomFilter(max(self.capacity, len(rows) * 2), self.error_rate)
+            self._window = {}
+        else:
+            bloom = self.bloom
+        for row in rows:
+            if row.jti in self._window:
+                continue
+            bloom.add(row.jti)
+            self.recent.set(row.jti, True, expires_at=calendar_timestamp(row.expires_at))
+            self._window[row.jti] = row.revoked_at
+
+        # Never let the watermark lag behind this read, even with no new rows
+        self.last_seen = max([started, *(row.revoked_at for row in rows)])
+        horizon = self.last_seen - self.skew
+        self._window = {jti: at for jti, at in self._window.items() if at >= horizon}
+
+        if rebuild:
+            # Local revocations committed after the snapshot was read
+            for jti in self._revoked_during_rebuild:
+                bloom.add(jti)
+            self._revoked_during_rebuild = None
+            self.bloom = bloom
+            self.next_rebuild = time.monotonic() + self.rebuild_seconds
+
+    @staticmethod
+    def _load(engine: Engine, since: Optional[datetime], purge: bool):
+        """(time the read started, live rows revoked at or after `since`, or all of them)"""
+        table = RevokedToken.__table__
+        started = datetime.utcnow()
+        query = select(table.c.jti, table.c.expires_at, table.c.revoked_at).where(table.c.expires_at > started)
+        if since is not None:
+            query = query.where(table.c.revoked_at >= since)
+        with engine.begin() as connection:
+            if purge:
+                connection.execute(delete(table).where(table.c.expires_at <= started))
+            return started, connection.execute(query).all()
+
+    def stats(self) -> dict:
+        return {
+            "bloom_entries": self.bloom.count,
+            "bloom_bits": self.bloom.size,
+            "bloom_hashes": self.bloom.hashes,
+            "bloom_negatives": self.bloom_negatives,
+            "table_lookups": self.lookups,
+            "recent": self.recent.stats(),
+        }
+
+
+def calendar_timestamp(value: datetime) -> float:
+    """POSIX timestamp of a naive UTC datetime"""
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+async def sync_revocations_periodically(store: TokenRevocationStore, engine: Engine, interval: float) -> None:
+    """Background loop run by the app: pull in other workers' revocations"""
+    while True:
+        await anyio.sleep(interval)
+        try:
+            await store.sync(engine)
+        except Exception:  # keep the loop alive; the next pass retries
+            logger.exception("Token revocation sync failed")
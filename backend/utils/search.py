@@ -0,0 +1,46 @@
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, table
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models.task import Task
+
+# External-content FTS5 table kept in sync with task by triggers (SQLite).
+# The column named after the table is FTS5's hidden "match the whole row" column.
+task_fts = table("task_fts", column("rowid"), column("rank"), column("task_fts"))
+
+# Generated tsvector column with a GIN index (PostgreSQL)
+task_search_vector = literal_column("task.search_vector")
+
+FTS_DIALECTS = ("sqlite", "postgresql")
+
+
+def search_terms(search: str) -> List[str]:
+    """Split a free-text query into word tokens safe for MATCH / to_tsquery"""
+    return re.findall(r"\w+", search)
+
+
+def apply_search(query, search: str, dialect_name: str) -> Tuple[object, Optional[ColumnElement]]:
+    """
+    Restrict a select(Task) to rows matching every term of `search`, each
+    treated as a prefix. Returns the filtered query and a rank expression
+    where lower is more relevant, or None when only a LIKE scan is available.
+    """
+    terms = search_terms(search)
+
+    if terms and dialect_name == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        query = query.join(task_fts, task_fts.c.rowid == Task.id).where(
+            task_fts.c.task_fts.op("MATCH")(match)
+        )
+        # FTS5 rank is bm25(), already "lower is better"
+        return query, task_fts.c.rank
+
+    if terms and dialect_name == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        query = query.where(task_search_vector.op("@@")(tsquery))
+        return query, -func.ts_rank(task_search_vector, tsquery)
+
+    query = query.where(Task.title.contains(search) | Task.description.contains(search))
+    return query, None
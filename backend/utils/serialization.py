@@ -0,0 +1,23 @@
+from typing import Dict, Sequence
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from ..models.task import Task, TaskRead
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+# orjson encodes datetimes, enums and dicts natively and several times faster
+# than the stdlib encoder; fall back to JSONResponse if it is not installed
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+# Column order used when tasks are selected as plain tuples
+TASK_READ_FIELDS = tuple(TaskRead.model_fields)
+TASK_READ_COLUMNS = tuple(getattr(Task, field) for field in TASK_READ_FIELDS)
+
+
+def task_row(row: Sequence) -> Dict:
+    """Map a tuple selected with TASK_READ_COLUMNS to the TaskRead shape"""
+    return dict(zip(TASK_READ_FIELDS, row))
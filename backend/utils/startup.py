@@ -0,0 +1,47 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StartupTimer:
+    """Wall-clock duration of each startup phase, for the log and /health/stats"""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.last = started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """Close a phase that ran since the previous mark"""
+        now = time.perf_counter()
+        self.phases[name] = now - self.last
+        self.last = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.last = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases.items())
+        return f"Startup: {parts} (total {self.total() * 1000:.1f} ms)"
+
+    def as_dict(self) -> Dict[str, float]:
+        timings = {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        timings["total"] = round(self.total() * 1000, 2)
+        return timings
+
+
+def warm_up() -> None:
+    """Import the modules kept off the startup path, once the app is serving"""
+    from jose import jwt  # noqa: F401
+
+    from .password import pwd_context
+
+    pwd_context()
@@ -0,0 +1,121 @@
+import base64
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import anyio
+from anyio import to_thread
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import Select
+
+from ..models.task import Task, TaskTombstone
+from .serialization import TASK_READ_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Deletes from any code path leave a tombstone behind. The SQLite timestamp is
+# padded to microseconds so it compares and parses like Python-written values.
+SQLITE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS task_tombstone_delete AFTER DELETE ON task BEGIN
+        INSERT INTO task_tombstone (task_id, user_id, deleted_at)
+        VALUES (old.id, old.user_id, strftime('%Y-%m-%d %H:%M:%f', 'now') || '000');
+    END""",
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION task_tombstone_apply() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO task_tombstone (task_id, user_id, deleted_at)
+        VALUES (OLD.id, OLD.user_id, clock_timestamp() AT TIME ZONE 'UTC');
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS task_tombstone_delete ON task",
+    """CREATE TRIGGER task_tombstone_delete AFTER DELETE ON task
+    FOR EACH ROW EXECUTE FUNCTION task_tombstone_apply()""",
+]
+
+
+class InvalidSyncToken(ValueError):
+    """Raised when a change token cannot be decoded"""
+
+
+class SyncToken(NamedTuple):
+    """Keyset positions reached in the task and tombstone change streams"""
+    task_time: datetime
+    task_id: int
+    tombstone_time: datetime
+    tombstone_id: int
+
+
+def encode_sync_token(token: SyncToken) -> str:
+    raw = json.dumps(
+        [token.task_time.isoformat(), token.task_id, token.tombstone_time.isoformat(), token.tombstone_id],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(value: str) -> SyncToken:
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        task_time, task_id, tombstone_time, tombstone_id = json.loads(base64.urlsafe_b64decode(padded))
+        return SyncToken(
+            datetime.fromisoformat(task_time),
+            int(task_id),
+            datetime.fromisoformat(tombstone_time),
+            int(tombstone_id),
+        )
+    except (ValueError, TypeError) as exc:
+        raise InvalidSyncToken("Invalid change token") from exc
+
+
+def safety_window(margin_seconds: float, busy_timeout_ms: int) -> timedelta:
+    """
+    How far behind the clock /changes reads. A row is stamped before its
+    commit and the commit can wait up to the busy timeout for the write
+    lock, so the window covers that wait plus a margin for the work between
+    stamp and commit.
+    """
+    return timedelta(seconds=busy_timeout_ms / 1000 + margin_seconds)
+
+
+def task_changes_statement(user_id: int, token: SyncToken, horizon: datetime, limit: int) -> Select:
+    """Tasks changed after the token's position and before the horizon, in keyset order"""
+    return (
+        select(*TASK_READ_COLUMNS)
+        .where(
+            Task.user_id == user_id,
+            Task.updated_at < horizon,
+            or_(
+                Task.updated_at > token.task_time,
+                and_(Task.updated_at == token.task_time, Task.id > token.task_id)
+            )
+        )
+        .order_by(Task.updated_at, Task.id)
+        .limit(limit)
+    )
+
+
+def compact_tombstones(connection: Connection, older_than: datetime) -> int:
+    """Drop tombstones no client can still need. Returns the number removed."""
+    result = connection.execute(
+        delete(TaskTombstone).where(TaskTombstone.deleted_at < older_than)
+    )
+    return result.rowcount
+
+
+async def compact_tombstones_periodically(engine: Engine, retention: timedelta, interval: float) -> None:
+    """Background loop run by the app: compact old tombstones every `interval` seconds"""
+    def compact() -> int:
+        with engine.begin() as connection:
+            return compact_tombstones(connection, datetime.utcnow() - retention)
+
+    while True:
+        await anyio.sleep(interval)
+        try:
+            await to_thread.run_sync(compact)
+        except Exception:  # keep the loop alive; the next pass retries
+            logger.exception("Tombstone compaction failed")
@@ -0,0 +1,94 @@
+from typing import Optional
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.engine import Connection
+
+from ..models.task import PriorityEnum, Task, TaskStats
+
+# Trigger bodies keeping task_stats in step with every write to task,
+# whichever handler (single, batch or import) issues it
+SQLITE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS task_stats_insert AFTER INSERT ON task BEGIN
+        INSERT INTO task_stats (user_id, total, completed, high_priority)
+        VALUES (new.user_id, 0, 0, 0) ON CONFLICT (user_id) DO NOTHING;
+        UPDATE task_stats SET
+            total = total + 1,
+            completed = completed + new.completed,
+            high_priority = high_priority + (new.priority = 'high')
+        WHERE user_id = new.user_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_stats_delete AFTER DELETE ON task BEGIN
+        UPDATE task_stats SET
+            total = total - 1,
+            completed = completed - old.completed,
+            high_priority = high_priority - (old.priority = 'high')
+        WHERE user_id = old.user_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_stats_update
+    AFTER UPDATE OF completed, priority, user_id ON task BEGIN
+        UPDATE task_stats SET
+            total = total - 1,
+            completed = completed - old.completed,
+            high_priority = high_priority - (old.priority = 'high')
+        WHERE user_id = old.user_id;
+        INSERT INTO task_stats (user_id, total, completed, high_priority)
+        VALUES (new.user_id, 0, 0, 0) ON CONFLICT (user_id) DO NOTHING;
+        UPDATE task_stats SET
+            total = total + 1,
+            completed = completed + new.completed,
+            high_priority = high_priority + (new.priority = 'high')
+        WHERE user_id = new.user_id;
+    END""",
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION task_stats_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE task_stats SET
+                total = total - 1,
+                completed = completed - OLD.completed::int,
+                high_priority = high_priority - (OLD.priority = 'high')::int
+            WHERE user_id = OLD.user_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO task_stats (user_id, total, completed, high_priority)
+            VALUES (NEW.user_id, 0, 0, 0) ON CONFLICT (user_id) DO NOTHING;
+            UPDATE task_stats SET
+                total = total + 1,
+                completed = completed + NEW.completed::int,
+                high_priority = high_priority + (NEW.priority = 'high')::int
+            WHERE user_id = NEW.user_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS task_stats_sync ON task",
+    """CREATE TRIGGER task_stats_sync
+    AFTER INSERT OR DELETE OR UPDATE OF completed, priority, user_id ON task
+    FOR EACH ROW EXECUTE FUNCTION task_stats_apply()""",
+]
+
+
+def rebuild_task_stats(connection: Connection, user_id: Optional[int] = None) -> int:
+    """
+    Recompute counters from the task table, for one user or everyone, to
+    repair any drift. Returns the number of counter rows written.
+    """
+    stats = TaskStats.__table__
+    clear = delete(stats)
+    totals = select(
+        Task.user_id,
+        func.count(Task.id),
+        func.sum(case((Task.completed, 1), else_=0)),
+        func.sum(case((Task.priority == PriorityEnum.high, 1), else_=0)),
+    ).group_by(Task.user_id)
+    if user_id is not None:
+        clear = clear.where(stats.c.user_id == user_id)
+        totals = totals.where(Task.user_id == user_id)
+
+    connection.execute(clear)
+    result = connection.execute(
+        insert(stats).from_select(["user_id", "total", "completed", "high_priority"], totals)
+    )
+    return result.rowcount
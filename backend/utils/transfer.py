@@ -0,0 +1,108 @@
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_COLUMNS = ["id", "title", "description", "completed", "priority", "due_date", "created_at", "updated_at"]
+IMPORT_FIELDS = ("title", "description", "completed", "priority", "due_date")
+
+# A single record longer than this is rejected instead of buffered
+MAX_RECORD_BYTES = 1 << 20
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ImportFormatError(ValueError):
+    """Raised when an upload cannot be split into records"""
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def export_records(rows: Iterable[Tuple], fmt: str, header: bool = False) -> str:
+    """Serialize a partition of EXPORT_COLUMNS tuples"""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(EXPORT_COLUMNS)
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without holding more than one record"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+        if len(pending) > MAX_RECORD_BYTES:
+            raise ImportFormatError("Record exceeds the maximum size")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Dict]]:
+    """
+    Parse an NDJSON or CSV upload incrementally, yielding (record number,
+    dict) pairs. Rows that cannot be parsed are yielded as (number, None).
+    """
+    number = 0
+    if fmt == "ndjson":
+        async for line in iter_lines(chunks):
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield number, record if isinstance(record, dict) else None
+        return
+
+    columns: Optional[List[str]] = None
+    record_text = ""
+    async for line in iter_lines(chunks):
+        # A quoted CSV field may contain newlines: keep joining lines until
+        # the quotes balance
+        record_text = f"{record_text}\n{line}" if record_text else line
+        if record_text.count('"') % 2:
+            if len(record_text) > MAX_RECORD_BYTES:
+                raise ImportFormatError("Record exceeds the maximum size")
+            continue
+        values = next(csv.reader([record_text.rstrip("\r")]), [])
+        record_text = ""
+        if not any(values):
+            continue
+        if columns is None:
+            columns = [name.strip() for name in values]
+            continue
+        number += 1
+        yield number, dict(zip(columns, values))
+
+
+def import_fields(record: Dict) -> Dict:
+    """Keep the user-settable task fields; empty CSV cells mean 'not given'"""
+    return {
+        field: record[field]
+        for field in IMPORT_FIELDS
+        if field in record and record[field] not in ("", None)
+    }
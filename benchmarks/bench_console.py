@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark the console TodoApp's in-memory task store (standard library only).
+
+  memory:  traced allocations for N tasks, the slotted Task against the
+           previous plain class with a __dict__ and two datetimes
+  listing: pending / completed selection through the status indexes against
+           the previous scan + filter + sort over every task, and the first
+           listing after toggles (which re-sorts the touched id set)
+  search:  queries through the inverted index against a substring scan of
+           every task, and the traced size of the index
+
+Run from the repository root:
+    python benchmarks/bench_console.py --tasks 1000000 --completed 0.1
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.main import Task, TodoApp  # noqa: E402
+from src.search import SearchIndex  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "ter", "sun", "ra", "vel", "no", "pi", "dor", "ex", "fa", "gri", "han", "zu", "bel"]
+# A 4096-word vocabulary of made-up words, with a Zipf-like word frequency
+WORDS = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES[:16]]
+WEIGHTS = [1 / rank for rank in range(1, len(WORDS) + 1)]
+
+
+class LegacyTask:
+    """Task as it was before __slots__"""
+
+    def __init__(self, task_id: int, title: str, description: str = "", completed: bool = False):
+        self.id = task_id
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+def traced_megabytes(task_class, count: int) -> float:
+    tracemalloc.start()
+    tasks = {i: task_class(i, f"Task number {i}", "Some description text") for i in range(1, count + 1)}
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tasks
+    return size / 1e6
+
+
+def timed(fn, repeat: int) -> float:
+    """Best wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def texts(count: int):
+    rng = random.Random(0)
+    words = rng.choices(WORDS, WEIGHTS, k=count * 6)
+    for i in range(count):
+        chunk = words[i * 6:i * 6 + 6]
+        yield " ".join(chunk[:3]), " ".join(chunk[3:])
+
+
+def build_app(count: int, completed_share: float) -> TodoApp:
+    app = TodoApp()
+    rng = random.Random(0)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for title, description in texts(count):
+            app.add_task(title, description)
+        for task_id in rng.sample(range(1, count + 1), int(count * completed_share)):
+            app.toggle_task_completion(task_id)
+    return app
+
+
+def legacy_select(app: TodoApp, show_completed: bool):
+    tasks = [task for task in list(app.tasks.values()) if task.completed == show_completed]
+    return sorted(tasks, key=lambda t: t.id)
+
+
+def index_megabytes(count: int) -> float:
+    items = list(texts(count))
+    tracemalloc.start()
+    index = SearchIndex()
+    for task_id, (title, description) in enumerate(items, 1):
+        index.add(task_id, f"{title} {description}")
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / 1e6
+
+
+def scan_select(app: TodoApp, query: str):
+    terms = query.lower().replace("*", "").split()
+    return [task for task in app.tasks.values() if all(term in task.text().lower() for term in terms)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--completed", type=float, default=0.1, help="share of tasks marked completed")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"memory for {args.tasks} tasks (traced allocations, task objects and id dict)")
+    legacy_mb = traced_megabytes(LegacyTask, args.tasks)
+    slotted_mb = traced_megabytes(Task, args.tasks)
+    print(f"  plain class  {legacy_mb:9.1f} MB  {legacy_mb * 1e6 / args.tasks:6.0f} B/task")
+    print(f"  __slots__    {slotted_mb:9.1f} MB  {slotted_mb * 1e6 / args.tasks:6.0f} B/task")
+
+    start = time.perf_counter()
+    app = build_app(args.tasks, args.completed)
+    print(f"\nbuilt app in {time.perf_counter() - start:.1f}s "
+          f"({len(app.pending)} pending, {len(app.completed)} completed)")
+    # Tasks were completed in random order, so the first completed listing pays the re-sort
+    print(f"  first completed listing (re-sort): {timed(lambda: app.select_tasks(True), 1):9.1f} ms")
+
+    print(f"\nlisting (best of {args.repeat})      scan+sort    indexed")
+    for label, flag in (("completed", True), ("pending", False), ("all", None)):
+        if flag is None:
+            legacy = timed(lambda: sorted(list(app.tasks.values()), key=lambda t: t.id), args.repeat)
+        else:
+            assert legacy_select(app, flag) == app.select_tasks(flag)
+            legacy = timed(lambda: legacy_select(app, flag), args.repeat)
+        indexed = timed(lambda: app.select_tasks(flag), args.repeat)
+        print(f"  {label:<10}                {legacy:9.1f} ms {indexed:9.1f} ms")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for task_id in range(1, 1001):
+            app.toggle_task_completion(task_id)
+    print(f"\nafter 1000 toggles, completed listing: {timed(lambda: app.select_tasks(True), 1):9.1f} ms")
+
+    common, frequent, rare = WORDS[0], WORDS[5], WORDS[3000]
+    queries = [common, f"{common} {frequent}", rare, f"{WORDS[100][:4]}*", f"{WORDS[40][:3]}* {frequent}"]
+    print(f"\nsearch (best of {args.repeat})      substring scan    index  results")
+    for query in queries:
+        scan = timed(lambda: scan_select(app, query), 1)
+        indexed = timed(lambda: app.find_tasks(query), args.repeat)
+        print(f"  {query:<22}  {scan:9.1f} ms {indexed:9.2f} ms  {len(app.find_tasks(query)):7}")
+    index_mb = index_megabytes(args.tasks)
+    print(f"  index size {index_mb:.1f} MB ({len(app.search_index.postings)} tokens)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the two ways a task list can be turned into a response body:
+
+  pydantic: ORM Task objects validated against List[TaskRead], dumped to
+            JSON-compatible Python and encoded with the stdlib (what FastAPI
+            does for a response_model with JSONResponse)
+  fast:     plain database tuples mapped to dicts and encoded with orjson
+            (what GET /api/tasks does now)
+
+Run from the repository root:
+    python benchmarks/bench_serialization.py --rows 10000 --repeat 5
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from backend.models import user  # noqa: E402,F401  (configures the Task mapper)
+from backend.models.task import PriorityEnum, Task, TaskRead  # noqa: E402
+from backend.utils.serialization import TASK_READ_FIELDS, FastJSONResponse, task_row  # noqa: E402
+
+
+def make_rows(count: int) -> List[tuple]:
+    now = datetime(2025, 1, 1)
+    priorities = list(PriorityEnum)
+    rows = []
+    for i in range(count):
+        values = {
+            "id": i + 1,
+            "user_id": 1,
+            "title": f"Task number {i}",
+            "description": "Some description text" if i % 2 else None,
+            "completed": i % 3 == 0,
+            "priority": priorities[i % 3],
+            "due_date": now + timedelta(days=i % 30) if i % 4 else None,
+            "created_at": now + timedelta(seconds=i),
+            "updated_at": now + timedelta(seconds=i),
+        }
+        rows.append(tuple(values[field] for field in TASK_READ_FIELDS))
+    return rows
+
+
+def pydantic_path(tasks: List[Task], adapter: TypeAdapter) -> bytes:
+    validated = adapter.validate_python(tasks, from_attributes=True)
+    return JSONResponse({"items": adapter.dump_python(validated, mode="json")}).body
+
+
+def fast_path(rows: List[tuple]) -> bytes:
+    return FastJSONResponse({"items": [task_row(row) for row in rows]}).body
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    tasks = [Task(**task_row(row)) for row in rows]
+    adapter = TypeAdapter(List[TaskRead])
+
+    slow = best_of(args.repeat, pydantic_path, tasks, adapter)
+    fast = best_of(args.repeat, fast_path, rows)
+
+    print(f"rows: {args.rows}, best of {args.repeat}")
+    print(f"pydantic + json : {slow * 1000:9.2f} ms")
+    print(f"tuples + orjson : {fast * 1000:9.2f} ms")
+    print(f"speedup         : {slow / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Load test for the task API.
+
+Seeds USERS users with TASKS tasks each, then runs CONCURRENCY workers that
+pick operations from a weighted mix for DURATION seconds (or until REQUESTS
+requests). Reports throughput and p50/p95/p99 latency per endpoint and writes
+the results as JSON so runs can be compared across commits.
+
+By default the app is driven in process through httpx's ASGI transport,
+against a fresh SQLite database in a temporary directory. Pass --url to
+load a running server instead (e.g. python start_backend.py --prod). A
+server's /api/auth budget allows only RATE_LIMIT_AUTH_IP_BURST calls per IP
+at once, so seeding over HTTP then waits out its 429s; with --seed-db the
+users and their tokens are created straight in the server's database
+instead (run with the server's DATABASE_URL and SECRET_KEY).
+
+Run from the repository root:
+    python benchmarks/load_test.py --users 10 --tasks 1000 --concurrency 20 --duration 15
+    python benchmarks/load_test.py --mix read --output results/main.json
+    python benchmarks/load_test.py --mix read --compare results/main.json
+    python benchmarks/load_test.py --url http://localhost:8000 --seed-db --mix read
+
+Needs httpx (benchmarks/requirements.txt).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORDS = [
+    "report", "meeting", "invoice", "review", "deploy", "groceries", "call", "email",
+    "design", "budget", "plan", "fix", "update", "draft", "release", "backup",
+]
+PRIORITIES = ["low", "medium", "high"]
+
+
+class UserState:
+    def __init__(self, email: str, password: str):
+        self.email = email
+        self.password = password
+        self.headers: Dict[str, str] = {}
+        self.task_ids: List[int] = []
+
+
+class Recorder:
+    """Latencies and status codes per endpoint label"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.failures: Dict[str, int] = defaultdict(int)
+
+    async def request(self, label: str, call: Awaitable[httpx.Response]) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await call
+        except httpx.HTTPError:
+            self.failures[label] += 1
+            return None
+        self.latencies[label].append(time.perf_counter() - started)
+        self.statuses[label][response.status_code] += 1
+        return response
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def random_title(rng: random.Random) -> str:
+    return " ".join(rng.sample(WORDS, 3))
+
+
+def random_task(rng: random.Random) -> dict:
+    task = {"title": random_title(rng), "priority": rng.choice(PRIORITIES)}
+    if rng.random() < 0.5:
+        task["description"] = " ".join(rng.choices(WORDS, k=8))
+    if rng.random() < 0.5:
+        task["due_date"] = (datetime.utcnow() + timedelta(days=rng.randint(-10, 30))).isoformat()
+    return task
+
+
+# Operations: each issues one request through the recorder
+
+async def op_register(client, recorder, users, rng):
+    email = f"load-{rng.getrandbits(64):x}@example.com"
+    await recorder.request("POST /api/auth/register", client.post(
+        "/api/auth/register", json={"email": email, "password": "load-test", "name": "Load"}
+    ))
+
+
+async def op_login(client, recorder, users, rng):
+    user = rng.choice(users)
+    await recorder.request("POST /api/auth/login", client.post(
+        "/api/auth/login", json={"email": user.email, "password": user.password}
+    ))
+
+
+async def op_list(client, recorder, users, rng):
+    user = rng.choice(users)
+    await recorder.request("GET /api/tasks", client.get("/api/tasks/", headers=user.headers))
+
+
+async def op_filter(client, recorder, users, rng):
+    user = rng.choice(users)
+    params = {"completed": rng.choice(["true", "false"]), "priority": rng.choice(PRIORITIES)}
+    await recorder.request("GET /api/tasks?filter", client.get("/api/tasks/", params=params, headers=user.headers))
+
+
+async def op_search(client, recorder, users, rng):
+    user = rng.choice(users)
+    params = {"search": rng.choice(WORDS)[: rng.randint(3, 6)]}
+    await recorder.request("GET /api/tasks?search", client.get("/api/tasks/", params=params, headers=user.headers))
+
+
+async def op_create(client, recorder, users, rng):
+    user = rng.choice(users)
+    response = await recorder.request("POST /api/tasks", client.post(
+        "/api/tasks/", json=random_task(rng), headers=user.headers
+    ))
+    if response is not None and response.status_code == 200:
+        user.task_ids.append(response.json()["id"])
+
+
+async def op_update(client, recorder, users, rng):
+    user = rng.choice(users)
+    if not user.task_ids:
+        return await op_create(client, recorder, users, rng)
+    task_id = rng.choice(user.task_ids)
+    await recorder.request("PUT /api/tasks/{task_id}", client.put(
+        f"/api/tasks/{task_id}", json={"title": random_title(rng)}, headers=user.headers
+    ))
+
+
+async def op_toggle(client, recorder, users, rng):
+    user = rng.choice(users)
+    if not user.task_ids:
+        return await op_create(client, recorder, users, rng)
+    task_id = rng.choice(user.task_ids)
+    await recorder.request("PATCH /api/tasks/{task_id}/complete", client.patch(
+        f"/api/tasks/{task_id}/complete", headers=user.headers
+    ))
+
+
+Operation = Callable[..., Awaitable[None]]
+
+# Weighted operation mixes
+MIXES: Dict[str, List[Tuple[Operation, int]]] = {
+    "mixed": [
+        (op_list, 30), (op_filter, 15), (op_search, 15), (op_create, 15),
+        (op_update, 10), (op_toggle, 10), (op_login, 4), (op_register, 1),
+    ],
+    "read": [(op_list, 50), (op_filter, 25), (op_search, 25)],
+    "write": [(op_create, 40), (op_update, 30), (op_toggle, 30)],
+    "auth": [(op_login, 80), (op_register, 20)],
+}
+
+
+async def post_patiently(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """POST while seeding, waiting out rate limiting (429) as the server asks"""
+    while True:
+        response = await client.post(url, **kwargs)
+        if response.status_code != 429:
+            response.raise_for_status()
+            return response
+        await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+
+
+def create_accounts_in_database(states: List[UserState]) -> None:
+    """
+    Insert the seed users and mint their access tokens through the backend
+    modules, skipping /api/auth and its per-IP budget. DATABASE_URL and
+    SECRET_KEY must be the server's for the tokens to be accepted.
+    """
+    sys.path.insert(0, str(ROOT))
+    from sqlmodel import Session
+
+    from backend.config import settings
+    from backend.database import engine
+    from backend.models.user import User
+    from backend.utils.auth import create_access_token
+    from backend.utils.password import get_password_hash
+
+    password_hash = get_password_hash(states[0].password)  # one bcrypt call for all
+    with Session(engine) as session:
+        session.add_all(User(email=state.email, name="Seed", password_hash=password_hash) for state in states)
+        session.commit()
+    lifetime = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    for state in states:
+        token = create_access_token(data={"sub": state.email}, expires_delta=lifetime)
+        state.headers = {"Authorization": f"Bearer {token}"}
+
+
+async def seed(
+    client: httpx.AsyncClient, users: int, tasks: int, batch_size: int, rng: random.Random,
+    in_database: bool = False
+) -> List[UserState]:
+    """Register and log in the users (or create them in the database), then create their tasks through /batch"""
+    # Unique per run, so a live server can be loaded repeatedly
+    run = os.urandom(4).hex()
+    states = [UserState(f"seed-{run}-{i}@example.com", "load-test") for i in range(users)]
+    if in_database and states:
+        await asyncio.to_thread(create_accounts_in_database, states)
+
+    async def setup(state: UserState) -> None:
+        if not state.headers:
+            await post_patiently(
+                client, "/api/auth/register", json={"email": state.email, "password": state.password, "name": "Seed"}
+            )
+            response = await post_patiently(
+                client, "/api/auth/login", json={"email": state.email, "password": state.password}
+            )
+            state.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        for start in range(0, tasks, batch_size):
+            count = min(batch_size, tasks - start)
+            response = await post_patiently(
+                client,
+                "/api/tasks/batch",
+                json={"create": [random_task(rng) for _ in range(count)]},
+                headers=state.headers,
+            )
+            state.task_ids.extend(item["id"] for item in response.json()["create"])
+
+    await asyncio.gather(*(setup(state) for state in states))
+    return states
+
+
+async def run_load(client, users, mix, concurrency, duration, max_requests, rng) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    operations, weights = zip(*MIXES[mix])
+    deadline = time.perf_counter() + duration
+    issued = 0
+
+    async def worker(worker_rng: random.Random) -> None:
+        nonlocal issued
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            operation = worker_rng.choices(operations, weights)[0]
+            await operation(client, recorder, users, worker_rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(rng.random())) for _ in range(concurrency)))
+    return recorder, time.perf_counter() - started
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, dict]:
+    endpoints = {}
+    for label in sorted(set(recorder.latencies) | set(recorder.failures)):
+        ordered = sorted(recorder.latencies[label])
+        statuses = recorder.statuses[label]
+        errors = sum(count for status, count in statuses.items() if status >= 400) + recorder.failures[label]
+        endpoints[label] = {
+            "requests": len(ordered) + recorder.failures[label],
+            "throughput_rps": len(ordered) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(ordered, 0.50) * 1000,
+            "p95_ms": percentile(ordered, 0.95) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+            "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+            "errors": errors,
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        }
+    return endpoints
+
+
+def print_report(endpoints: Dict[str, dict], total: dict, baseline: Optional[dict]) -> None:
+    header = f"{'endpoint':38} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    if baseline:
+        header += f" {'p95 vs base':>12} {'rps vs base':>12}"
+    print(header)
+    print("-" * len(header))
+    rows = list(endpoints.items()) + [("TOTAL", total)]
+    for label, stats in rows:
+        line = (
+            f"{label:38} {stats['requests']:7d} {stats['throughput_rps']:8.1f} {stats['p50_ms']:8.2f} "
+            f"{stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} {stats['errors']:7d}"
+        )
+        if baseline:
+            base = baseline["total"] if label == "TOTAL" else baseline["endpoints"].get(label)
+            if base:
+                line += f" {change(stats['p95_ms'], base['p95_ms']):>12} {change(stats['throughput_rps'], base['throughput_rps']):>12}"
+        print(line)
+
+
+def change(current: float, previous: float) -> str:
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@asynccontextmanager
+async def in_process_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Import the app against a throwaway database, run its lifespan (the ASGI
+    transport does not) and wrap it in an ASGI transport
+    """
+    # Measure the API itself, not the per-client rate limits
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    if "DATABASE_URL" not in os.environ:
+        database = Path(tempfile.mkdtemp(prefix="todo-load-")) / "load.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    sys.path.insert(0, str(ROOT))
+    from backend.main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=60
+        ) as client:
+            yield client
+
+
+async def main_async(args) -> dict:
+    rng = random.Random(args.seed)
+    if args.url:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60)
+    else:
+        client = in_process_client()
+
+    async with client as client:
+        seed_started = time.perf_counter()
+        users = await seed(client, args.users, args.tasks, args.batch_size, rng, in_database=args.seed_db)
+        seed_seconds = time.perf_counter() - seed_started
+        print(f"seeded {args.users} users x {args.tasks} tasks in {seed_seconds:.1f}s")
+
+        recorder, elapsed = await run_load(
+            client, users, args.mix, args.concurrency, args.duration, args.requests, rng
+        )
+
+    endpoints = summarize(recorder, elapsed)
+    all_latencies = sorted(value for values in recorder.latencies.values() for value in values)
+    total = {
+        "requests": sum(stats["requests"] for stats in endpoints.values()),
+        "throughput_rps": len(all_latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(all_latencies, 0.50) * 1000,
+        "p95_ms": percentile(all_latencies, 0.95) * 1000,
+        "p99_ms": percentile(all_latencies, 0.99) * 1000,
+        "max_ms": (all_latencies[-1] if all_latencies else 0.0) * 1000,
+        "errors": sum(stats["errors"] for stats in endpoints.values()),
+    }
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "target": args.url or "in-process",
+        "config": {
+            "users": args.users, "tasks": args.tasks, "mix": args.mix, "concurrency": args.concurrency,
+            "duration": args.duration, "requests": args.requests, "seed": args.seed,
+        },
+        "seed_seconds": seed_seconds,
+        "elapsed_seconds": elapsed,
+        "total": total,
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: drive the app in process)")
+    parser.add_argument(
+        "--seed-db", action="store_true",
+        help="with --url, create seed users and tokens in the server's database instead of via /api/auth"
+    )
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=500, help="tasks seeded per user")
+    parser.add_argument("--batch-size", type=int, default=500, help="tasks per /batch call while seeding")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many requests")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+    if args.seed_db and not args.url:
+        parser.error("--seed-db only applies with --url")
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    results = asyncio.run(main_async(args))
+
+    print(f"mix={args.mix} concurrency={args.concurrency} elapsed={results['elapsed_seconds']:.1f}s")
+    print_report(results["endpoints"], results["total"], baseline)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,119 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { taskAPI } from '@/lib/api';
-import { Task, TaskCreate } from '@/lib/types';
+import { Task, TaskCreate, TaskStats } from '@/lib/types';
 
 export default function DashboardPage() {
   const [tasks, setTasks] = useState<Task[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [stats, setStats] = useState<TaskStats | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [newTask, setNewTask] = useState<TaskCreate>({ title: '', description: '', priority: 'medium' });
   const [error, setError] = useState<string | null>(null);
   const [filter, setFilter] = useState<'all' | 'active' | 'completed'>('all');
+  // Read by fetches started from the change feed, which outlive a render
+  const filterRef = useRef(filter);
+  filterRef.current = filter;
+  const statsTimer = useRef<ReturnType<typeof setTimeout> | null>(null);
 
-  // Fetch tasks on component mount
+  // Fetch the first page whenever the filter changes
   useEffect(() => {
     fetchTasks();
+  }, [filter]);
+
+  // Apply changes made in other tabs or devices as they happen
+  useEffect(() => {
+    if (!localStorage.getItem('access_token')) return;
+
+    let source: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+    const payload = (event: Event) => JSON.parse((event as MessageEvent).data);
+
+    const connect = async () => {
+      let stream: EventSource;
+      try {
+        // A fresh ticket per connection; once one expires the server refuses
+        // the EventSource's own reconnect and we come back here
+        const response = await taskAPI.streamTicket();
+        if (closed) return;
+        stream = new EventSource(taskAPI.streamUrl(response.data.ticket));
+        source = stream;
+      } catch (err) {
+        console.error('Error opening task stream:', err);
+        if (!closed) retry = setTimeout(connect, 5000);
+        return;
+      }
+
+      stream.addEventListener('created', (event) => {
+        const task: Task = payload(event);
+        setTasks(prev => (prev.some(t => t.id === task.id) ? prev : [task, ...prev]));
+        refreshStats();
+      });
+      stream.addEventListener('updated', (event) => {
+        const task: Task = payload(event);
+        setTasks(prev => prev.map(t => (t.id === task.id ? task : t)));
+      });
+      stream.addEventListener('completed', (event) => {
+        const { id, completed } = payload(event);
+        setTasks(prev => prev.map(t => (t.id === id ? { ...t, completed } : t)));
+        refreshStats();
+      });
+      stream.addEventListener('deleted', (event) => {
+        const { id } = payload(event);
+        setTasks(prev => prev.filter(t => t.id !== id));
+        refreshStats();
+      });
+      stream.addEventListener('resync', () => fetchTasks());
+      stream.onerror = () => {
+        if (stream.readyState === EventSource.CLOSED && !closed) {
+          retry = setTimeout(connect, 3000);
+        }
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      source?.close();
+    };
   }, []);
 
-  // Fetch tasks from API
+  // Completed filter as sent to the API
+  const completedParam = () =>
+    filterRef.current === 'all' ? undefined : filterRef.current === 'completed';
+
+  // Totals come from the maintained counters, not from walking the list
+  const fetchStats = async () => {
+    try {
+      const response = await taskAPI.stats();
+      setStats(response.data);
+    } catch (err) {
+      console.error('Error fetching task stats:', err);
+    }
+  };
+
+  // Coalesce refreshes after changes, so a burst of streamed events costs
+  // one stats request rather than one each against the per-user rate limit
+  const refreshStats = () => {
+    if (statsTimer.current) return;
+    statsTimer.current = setTimeout(() => {
+      statsTimer.current = null;
+      fetchStats();
+    }, 1000);
+  };
+
+  // Fetch the first page of tasks from API
   const fetchTasks = async () => {
     try {
       setLoading(true);
-      const response = await taskAPI.getAll();
-      setTasks(response.data);
+      const response = await taskAPI.getAll({ completed: completedParam() });
+      setTasks(response.data.items);
+      setNextCursor(response.data.next_cursor);
+      fetchStats();
     } catch (err) {
       setError('Failed to load tasks');
       console.error('Error fetching tasks:', err);
@@ -30,6 +122,23 @@ export default function DashboardPage() {
     }
   };
 
+  // Append the next page
+  const loadMoreTasks = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const response = await taskAPI.getAll({ completed: completedParam(), cursor: nextCursor });
+      const page: Task[] = response.data.items;
+      setTasks(prev => [...prev, ...page.filter(task => !prev.some(t => t.id === task.id))]);
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      setError('Failed to load tasks');
+      console.error('Error fetching tasks:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Handle form input changes
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement | HTMLTextAreaElement | HTMLSelectElement>) => {
     const { name, value } = e.target;
@@ -42,6 +151,7 @@ export default function DashboardPage() {
     try {
       const response = await taskAPI.create(newTask);
       setTasks(prev => [response.data, ...prev]);
+      refreshStats();
       setNewTask({ title: '', description: '', priority: 'medium' });
     } catch (err) {
       setError('Failed to create task');
@@ -61,6 +171,7 @@ export default function DashboardPage() {
           t.id === id ? { ...t, completed: response.data.completed } : t
         )
       );
+      refreshStats();
     } catch (err) {
       setError('Failed to update task');
       console.error('Error updating task:', err);
@@ -74,13 +185,14 @@ export default function DashboardPage() {
     try {
       await taskAPI.delete(id);
       setTasks(prev => prev.filter(t => t.id !== id));
+      refreshStats();
     } catch (err) {
       setError('Failed to delete task');
       console.error('Error deleting task:', err);
     }
   };
 
-  // Filter tasks based on selected filter
+  // The server already filters; this keeps toggled and streamed tasks consistent
   const filteredTasks = tasks.filter(task => {
     if (filter === 'active') return !task.completed;
     if (filter === 'completed') return task.completed;
@@ -98,6 +210,12 @@ export default function DashboardPage() {
         <header className="mb-8">
           <h1 className="text-3xl font-bold text-gray-800">My Tasks</h1>
           <p className="text-gray-600">Manage your todo items efficiently</p>
+          {stats && (
+            <p className="text-sm text-gray-500 mt-1">
+              {stats.total} total · {stats.pending} pending · {stats.completed} completed
+              {stats.overdue > 0 && ` · ${stats.overdue} overdue`}
+            </p>
+          )}
         </header>
 
         <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
@@ -283,6 +401,16 @@ export default function DashboardPage() {
                       </div>
                     </div>
                   ))}
+
+                  {nextCursor && (
+                    <button
+                      onClick={loadMoreTasks}
+                      disabled={loadingMore}
+                      className="w-full py-2 rounded-lg text-sm bg-gray-200 text-gray-700 hover:bg-gray-300 disabled:opacity-50"
+                    >
+                      {loadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                  )}
                 </div>
               )}
             </div>
@@ -45,9 +45,15 @@ export const authAPI = {
   login: (credentials: { email: string; password: string }) =>
     api.post('/auth/login', credentials),
 
-  logout: () => {
+  logout: async () => {
+    // Revoke the token server-side; sign out locally even if that fails
+    try {
+      await api.post('/auth/logout');
+    } catch {
+      // already expired or revoked
+    }
     localStorage.removeItem('access_token');
-    return Promise.resolve({ data: { message: 'Logged out successfully' } });
+    return { data: { message: 'Logged out successfully' } };
   },
 
   getCurrentUser: () => {
@@ -74,7 +80,7 @@ export const authAPI = {
 
 // Task API functions
 export const taskAPI = {
-  getAll: (params?: { completed?: boolean; priority?: string; search?: string }) =>
+  getAll: (params?: { completed?: boolean; priority?: string; search?: string; limit?: number; cursor?: string }) =>
     api.get('/tasks', { params }),
 
   create: (taskData: { title: string; description?: string; priority?: string; due_date?: string }) =>
@@ -86,6 +92,22 @@ export const taskAPI = {
   delete: (id: number) => api.delete(`/tasks/${id}`),
 
   toggleComplete: (id: number) => api.patch(`/tasks/${id}/complete`),
+
+  stats: () => api.get('/tasks/stats'),
+
+  // EventSource cannot send headers, so the change feed is opened with a
+  // short-lived ticket in the URL rather than the access token
+  streamTicket: () => api.post('/tasks/ticket'),
+
+  streamUrl: (ticket: string) =>
+    `${API_BASE_URL}/api/tasks/stream?ticket=${encodeURIComponent(ticket)}`,
+
+  batch: (operations: {
+    create?: { title: string; description?: string; priority?: string; due_date?: string }[];
+    update?: ({ id: number } & { title?: string; description?: string; priority?: string; due_date?: string; completed?: boolean })[];
+    toggle_complete?: number[];
+    delete?: number[];
+  }) => api.post('/tasks/batch', operations),
 };
 
 export default api;
\ No newline at end of file
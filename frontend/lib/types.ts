@@ -18,6 +18,19 @@ export interface Task {
   updated_at: string;
 }
 
+export interface TaskPage {
+  items: Task[];
+  next_cursor: string | null;
+}
+
+export interface TaskStats {
+  total: number;
+  completed: number;
+  pending: number;
+  high_priority: number;
+  overdue: number;
+}
+
 export interface TaskCreate {
   title: string;
   description?: string;
@@ -60,7 +60,7 @@ echo ""
 echo "To run the application:"
 echo ""
 echo "Terminal 1 - Start the backend:"
-echo "  cd backend && uvicorn main:app --reload --port 8000"
+echo "  python start_backend.py"
 echo ""
 echo "Terminal 2 - Start the frontend:"
 echo "  cd frontend && npm run dev"
@@ -68,6 +68,6 @@ echo ""
 echo "Then open your browser to http://localhost:3000"
 echo ""
 echo "For a complete setup with both servers running:"
-echo "  1. Run the backend in one terminal: bash start_backend.py"
+echo "  1. Run the backend in one terminal: python start_backend.py"
 echo "  2. Run the frontend in another terminal: node start_frontend.js"
 echo ""
\ No newline at end of file
@@ -9,23 +9,52 @@ Implements all 5 Basic Level features:
 3. Update Task
 4. View Task List
 5. Mark as Complete
+
+Also: word search over titles and descriptions through an incremental
+inverted index (see search.py).
+
+Tasks persist across runs in an append-only operation log with snapshot
+compaction (see storage.py), kept in TODO_DATA_DIR (default ~/.todo_app).
+
+Without arguments the interactive menu starts; with a command (`add`,
+`list`, `search`, `update`, `toggle`, `delete`, or `run FILE` for a script
+of them) it runs non-interactively. See `python src/main.py --help`.
 """
 
+import argparse
+import io
 import json
+import os
+import re
+import shlex
+import sys
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, TextIO
+
+try:
+    from .search import SearchIndex
+    from .storage import DataDirectoryLocked, TaskLog
+except ImportError:  # run as a script: python src/main.py
+    from search import SearchIndex
+    from storage import DataDirectoryLocked, TaskLog
+
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".todo_app")
+OUTPUT_BUFFER_SIZE = 1 << 20
 
 
 class Task:
     """Represents a single todo task"""
 
+    # No per-instance __dict__, which saves about 90 bytes per task
+    __slots__ = ("id", "title", "description", "completed", "created_at", "updated_at")
+
     def __init__(self, task_id: int, title: str, description: str = "", completed: bool = False):
         self.id = task_id
         self.title = title
         self.description = description
         self.completed = completed
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        # A new task shares one datetime for both stamps until it is first changed
+        self.created_at = self.updated_at = datetime.now()
 
     def to_dict(self) -> Dict:
         """Convert task to dictionary for JSON serialization"""
@@ -38,17 +67,82 @@ class Task:
             "updated_at": self.updated_at.isoformat()
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Task":
+        """Rebuild a task from to_dict() output"""
+        task = cls(data["id"], data["title"], data["description"], data["completed"])
+        task.created_at = datetime.fromisoformat(data["created_at"])
+        task.updated_at = datetime.fromisoformat(data["updated_at"])
+        return task
+
+    def text(self) -> str:
+        """Searchable text: title and description"""
+        return f"{self.title} {self.description}"
+
     def __str__(self) -> str:
         status = "✓" if self.completed else "○"
         return f"[{status}] {self.id}. {self.title} - {self.description}"
 
 
 class TodoApp:
-    """Main Todo Application class with in-memory storage"""
-
-    def __init__(self):
+    """
+    Main Todo Application class with in-memory storage, optionally persisted to a TaskLog
+
+    `tasks` is the primary index; ids only ever grow, so its insertion order
+    is id order. `pending` and `completed` are ordered id sets (dicts with
+    None values) by status, so a filtered listing touches only the tasks it
+    returns. A toggled task is appended out of order; the set is re-sorted
+    lazily on its next listing, which is a near-linear merge of two runs.
+    `search_index` maps title and description tokens to task ids.
+    """
+
+    def __init__(self, storage: Optional[TaskLog] = None, quiet: bool = False, out: Optional[TextIO] = None):
+        # quiet: methods only return results; otherwise messages and tables go to out (stdout by default)
+        self.quiet = quiet
+        self.out = out
         self.tasks: Dict[int, Task] = {}
+        self.pending: Dict[int, None] = {}
+        self.completed: Dict[int, None] = {}
+        self._unsorted = set()  # statuses whose id set is out of id order
+        self.search_index = SearchIndex()
         self.next_id = 1
+        self.storage = storage
+        if storage is not None:
+            records, self.next_id = storage.load()
+            for record in records.values():
+                task = Task.from_dict(record)
+                self.tasks[task.id] = task
+                self._index(task)
+                self.search_index.add(task.id, task.text())
+
+    def _status_ids(self, completed: bool) -> Dict[int, None]:
+        return self.completed if completed else self.pending
+
+    def _index(self, task: Task) -> None:
+        ids = self._status_ids(task.completed)
+        if ids and task.id < next(reversed(ids)):
+            self._unsorted.add(task.completed)
+        ids[task.id] = None
+
+    def _unindex(self, task: Task) -> None:
+        del self._status_ids(task.completed)[task.id]
+
+    def _say(self, message: str) -> None:
+        if not self.quiet:
+            print(message, file=self.out)
+
+    def _persist(self, op: Dict) -> None:
+        """Log a change; fold the log into a new snapshot once it outgrows the state"""
+        if self.storage is None:
+            return
+        self.storage.append(op)
+        if self.storage.should_compact(len(self.tasks)):
+            self.storage.compact((task.to_dict() for task in self.tasks.values()), self.next_id)
+
+    def close(self) -> None:
+        """Flush pending changes to disk"""
+        if self.storage is not None:
+            self.storage.close()
 
     def add_task(self, title: str, description: str = "") -> Task:
         """Add a new task to the todo list"""
@@ -57,27 +151,34 @@ class TodoApp:
 
         task = Task(self.next_id, title.strip(), description.strip())
         self.tasks[self.next_id] = task
+        self.pending[task.id] = None
+        self.search_index.add(task.id, task.text())
         self.next_id += 1
-        print(f"✓ Task added: {task.title}")
+        self._persist({"op": "add", **task.to_dict()})
+        self._say(f"✓ Task added: {task.title}")
         return task
 
     def delete_task(self, task_id: int) -> bool:
         """Delete a task by ID"""
         if task_id in self.tasks:
             deleted_task = self.tasks.pop(task_id)
-            print(f"✓ Task deleted: {deleted_task.title}")
+            self._unindex(deleted_task)
+            self.search_index.remove(task_id, deleted_task.text())
+            self._persist({"op": "delete", "id": task_id})
+            self._say(f"✓ Task deleted: {deleted_task.title}")
             return True
         else:
-            print(f"✗ Task with ID {task_id} not found")
+            self._say(f"✗ Task with ID {task_id} not found")
             return False
 
     def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None) -> bool:
         """Update an existing task"""
         if task_id not in self.tasks:
-            print(f"✗ Task with ID {task_id} not found")
+            self._say(f"✗ Task with ID {task_id} not found")
             return False
 
         task = self.tasks[task_id]
+        old_text = task.text()
         updated = False
 
         if title is not None:
@@ -86,7 +187,7 @@ class TodoApp:
                 task.title = new_title
                 updated = True
             else:
-                print("✗ Task title cannot be empty")
+                self._say("✗ Task title cannot be empty")
                 return False
 
         if description is not None:
@@ -95,49 +196,100 @@ class TodoApp:
 
         if updated:
             task.updated_at = datetime.now()
-            print(f"✓ Task updated: {task.title}")
+            self.search_index.replace(task_id, old_text, task.text())
+            self._persist({
+                "op": "update",
+                "id": task_id,
+                "title": task.title,
+                "description": task.description,
+                "updated_at": task.updated_at.isoformat(),
+            })
+            self._say(f"✓ Task updated: {task.title}")
 
         return updated
 
     def toggle_task_completion(self, task_id: int) -> bool:
         """Toggle the completion status of a task"""
         if task_id not in self.tasks:
-            print(f"✗ Task with ID {task_id} not found")
+            self._say(f"✗ Task with ID {task_id} not found")
             return False
 
         task = self.tasks[task_id]
+        self._unindex(task)
         task.completed = not task.completed
+        self._index(task)
         task.updated_at = datetime.now()
+        # The resulting state is logged, not the toggle, so replay is idempotent
+        self._persist({
+            "op": "update",
+            "id": task_id,
+            "completed": task.completed,
+            "updated_at": task.updated_at.isoformat(),
+        })
 
         status = "completed" if task.completed else "marked as incomplete"
-        print(f"✓ Task {status}: {task.title}")
+        self._say(f"✓ Task {status}: {task.title}")
         return True
 
     def list_tasks(self, show_completed: Optional[bool] = None) -> List[Task]:
         """List all tasks, optionally filtered by completion status"""
-        tasks = list(self.tasks.values())
-
-        if show_completed is not None:
-            tasks = [task for task in tasks if task.completed == show_completed]
-
-        if not tasks:
-            print("No tasks found.")
-        else:
-            print(f"\n{'ID':<4} {'Status':<8} {'Title':<30} {'Description'}")
-            print("-" * 70)
-            for task in sorted(tasks, key=lambda t: t.id):
-                status = "✓ Done" if task.completed else "○ Pending"
-                title = task.title[:27] + "..." if len(task.title) > 30 else task.title
-                desc = task.description[:30] + "..." if len(task.description) > 30 else task.description
-                print(f"{task.id:<4} {status:<8} {title:<30} {desc}")
+        tasks = self.select_tasks(show_completed)
+        if not self.quiet:
+            print_tasks(tasks, self.out)
+        return tasks
 
+    def search_tasks(self, query: str, show_completed: Optional[bool] = None) -> List[Task]:
+        """
+        List tasks whose title or description contains every term of the
+        query; a term ending in * matches words starting with it
+        """
+        tasks = self.find_tasks(query, show_completed)
+        if not self.quiet:
+            print_tasks(tasks, self.out)
         return tasks
 
+    def select_tasks(self, show_completed: Optional[bool] = None) -> List[Task]:
+        """Tasks in id order, optionally filtered by completion status, without printing"""
+        if show_completed is None:
+            return list(self.tasks.values())
+        if show_completed in self._unsorted:
+            ids = dict.fromkeys(sorted(self._status_ids(show_completed)))
+            if show_completed:
+                self.completed = ids
+            else:
+                self.pending = ids
+            self._unsorted.discard(show_completed)
+        tasks = self.tasks
+        return [tasks[task_id] for task_id in self._status_ids(show_completed)]
+
+    def find_tasks(self, query: str, show_completed: Optional[bool] = None) -> List[Task]:
+        """Search results in id order, optionally filtered by completion status, without printing"""
+        ids = self.search_index.search(query)
+        if show_completed is not None:
+            status_ids = self._status_ids(show_completed)
+            ids = [task_id for task_id in ids if task_id in status_ids]
+        tasks = self.tasks
+        return [tasks[task_id] for task_id in ids]
+
     def get_task(self, task_id: int) -> Optional[Task]:
         """Get a specific task by ID"""
         return self.tasks.get(task_id)
 
 
+def print_tasks(tasks: List[Task], file: Optional[TextIO] = None) -> None:
+    """Print tasks as a table, in a single write"""
+    if not tasks:
+        print("No tasks found.", file=file)
+        return
+    lines = [f"\n{'ID':<4} {'Status':<8} {'Title':<30} {'Description'}", "-" * 70]
+    for task in tasks:
+        status = "✓ Done" if task.completed else "○ Pending"
+        title = task.title[:27] + "..." if len(task.title) > 30 else task.title
+        desc = task.description[:30] + "..." if len(task.description) > 30 else task.description
+        lines.append(f"{task.id:<4} {status:<8} {title:<30} {desc}")
+    print("\n".join(lines), file=file)
+
+
 def print_menu():
     """Print the application menu"""
     print("\n" + "="*50)
@@ -150,7 +302,8 @@ def print_menu():
     print("5. Update Task")
     print("6. Delete Task")
     print("7. Mark Task as Complete/Incomplete")
-    print("8. Exit")
+    print("8. Search Tasks")
+    print("9. Exit")
     print("-"*50)
 
 
@@ -159,15 +312,236 @@ def get_user_input(prompt: str) -> str:
     return input(prompt).strip()
 
 
-def main():
-    """Main application loop"""
-    app = TodoApp()
+class CommandError(ValueError):
+    """A command line in a script that does not parse"""
+
+
+class CommandParser(argparse.ArgumentParser):
+    """Parser for script lines: reports errors instead of exiting"""
+
+    def error(self, message):
+        raise CommandError(message)
+
+    def exit(self, status=0, message=None):
+        raise CommandError(message or "help is only available on the command line")
+
+
+def build_parser(parser_class=argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser = parser_class(
+        prog="main.py",
+        description="Todo console app. Without a command, starts the interactive menu.",
+    )
+    parser.add_argument("--data-dir", default=os.environ.get("TODO_DATA_DIR", DEFAULT_DATA_DIR),
+                        help="where tasks are stored (TODO_DATA_DIR, default ~/.todo_app)")
+    parser.add_argument("--format", choices=("table", "jsonl"), default="table",
+                        help="output as console tables and messages, or one JSON object per line")
+    commands = parser.add_subparsers(dest="command", required=True, parser_class=parser_class)
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("title")
+    add.add_argument("description", nargs="?", default="")
+
+    listing = commands.add_parser("list", help="list tasks")
+    search = commands.add_parser("search", help="search titles and descriptions (word* for a prefix)")
+    search.add_argument("query", nargs="+")
+    for command in (listing, search):
+        status = command.add_mutually_exclusive_group()
+        status.add_argument("--pending", dest="show_completed", action="store_const", const=False)
+        status.add_argument("--completed", dest="show_completed", action="store_const", const=True)
+
+    update = commands.add_parser("update", help="change a task's title and/or description")
+    update.add_argument("id", type=int)
+    update.add_argument("--title")
+    update.add_argument("--description")
+
+    for name, help_text in (("toggle", "mark a task complete/incomplete"), ("delete", "delete a task")):
+        commands.add_parser(name, help=help_text).add_argument("id", type=int)
+
+    run = commands.add_parser("run", help="apply commands read one per line from a file, or stdin with -")
+    run.add_argument("file", nargs="?", default="-")
+    return parser
+
+
+class BatchRunner:
+    """
+    Applies parsed commands to a TodoApp and reports through one buffered
+    writer. With console tables the app writes its usual messages there;
+    with JSON lines the app is quiet and each result is one JSON object.
+    """
+
+    def __init__(self, app: TodoApp, out: TextIO, jsonl: bool):
+        self.app = app
+        self.out = out
+        self.jsonl = jsonl
+        self.failures = 0
+
+    def emit(self, record: Dict) -> None:
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def emit_tasks(self, tasks: List[Task]) -> None:
+        self.out.writelines(json.dumps(task.to_dict(), ensure_ascii=False) + "\n" for task in tasks)
+
+    def fail(self, message: str, line: Optional[int] = None) -> bool:
+        self.failures += 1
+        if self.jsonl:
+            self.emit({"error": message} if line is None else {"error": message, "line": line})
+        else:
+            self.out.write(f"✗ {message}\n" if line is None else f"✗ line {line}: {message}\n")
+        return False
+
+    def execute(self, args: argparse.Namespace, line: Optional[int] = None) -> bool:
+        """Apply one command; problems are reported, not raised"""
+        app = self.app
+        command = args.command
+        if command in ("list", "search"):
+            if command == "list":
+                tasks = app.list_tasks(args.show_completed)
+            else:
+                tasks = app.search_tasks(" ".join(args.query), args.show_completed)
+            if self.jsonl:
+                self.emit_tasks(tasks)
+            return True
+        if command == "add":
+            try:
+                task = app.add_task(args.title, args.description)
+            except ValueError as e:
+                return self.fail(str(e), line)
+            if self.jsonl:
+                self.emit(task.to_dict())
+            return True
+        if command == "run":
+            return self.fail("run cannot be used inside a script", line)
+
+        task = app.get_task(args.id)
+        if task is None:
+            return self.fail(f"Task with ID {args.id} not found", line)
+        if command == "delete":
+            app.delete_task(args.id)
+            if self.jsonl:
+                self.emit({"id": args.id, "deleted": True})
+            return True
+        if command == "update":
+            if args.title is None and args.description is None:
+                return self.fail("Nothing to update: pass --title and/or --description", line)
+            if args.title is not None and not args.title.strip():
+                return self.fail("Task title cannot be empty", line)
+            app.update_task(args.id, args.title, args.description)
+        else:
+            app.toggle_task_completion(args.id)
+        if self.jsonl:
+            self.emit(task.to_dict())
+        return True
+
+    def run_script(self, lines: Iterable[str]) -> None:
+        """Apply one command per line; blank lines and # comments are skipped"""
+        parser = build_parser(CommandParser)
+        for number, text in enumerate(lines, 1):
+            try:
+                words = split_line(text)
+                if words:
+                    self.execute(parse_line(parser, words), number)
+            except (CommandError, ValueError) as e:
+                self.fail(str(e), number)
+
+
+# Lines whose words are bare or wholly quoted, without escapes or comments
+SIMPLE_LINE = re.compile(r"""\s*(?:(?:"[^"\\]*"|'[^'\\]*'|[^\s"'\\#]+)(?=\s|$)\s*)*""")
+SIMPLE_WORD = re.compile(r"\"([^\"]*)\"|'([^']*)'|(\S+)")
+
+
+def split_line(text: str) -> List[str]:
+    # shlex costs tens of microseconds a line; most lines need only the simple rules
+    if SIMPLE_LINE.fullmatch(text):
+        return [match.group(match.lastindex) for match in SIMPLE_WORD.finditer(text)]
+    return shlex.split(text, comments=True)
+
+
+def parse_line(parser: argparse.ArgumentParser, words: List[str]) -> argparse.Namespace:
+    """
+    Parse a script line. The plain positional forms of add, toggle and delete,
+    which make up bulk scripts, skip argparse (about 100µs a line); anything
+    else, including every option, goes through the full parser.
+    """
+    command, rest = words[0], words[1:]
+    if not any(word.startswith("-") for word in rest):
+        if command == "add" and 1 <= len(rest) <= 2:
+            return argparse.Namespace(command="add", title=rest[0], description=rest[1] if len(rest) == 2 else "")
+        if command in ("toggle", "delete") and len(rest) == 1 and rest[0].isdigit():
+            return argparse.Namespace(command=command, id=int(rest[0]))
+    return parser.parse_args(words)
+
+
+def buffered_stdout() -> TextIO:
+    """A large-buffer writer over the stdout file descriptor, or stdout itself if it has none"""
+    sys.stdout.flush()
+    try:
+        return open(sys.stdout.fileno(), "w", buffering=OUTPUT_BUFFER_SIZE, closefd=False,
+                    encoding=sys.stdout.encoding, errors=sys.stdout.errors)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return sys.stdout
+
+
+def run_cli(argv: List[str], stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None) -> int:
+    """Run one command, or a script of them, without prompting; exit status 1 if any failed"""
+    args = build_parser().parse_args(argv)
+    script = None
+    if args.command == "run":
+        if args.file == "-":
+            script = stdin if stdin is not None else sys.stdin
+        else:
+            try:
+                script = open(args.file, encoding="utf-8")
+            except OSError as e:
+                print(f"error: {args.file}: {e.strerror}", file=sys.stderr)
+                return 1
+    out = stdout if stdout is not None else buffered_stdout()
+    jsonl = args.format == "jsonl"
+    try:
+        app = TodoApp(TaskLog(args.data_dir), quiet=jsonl, out=out)
+    except DataDirectoryLocked as e:
+        if script is not None and args.file != "-":
+            script.close()
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    runner = BatchRunner(app, out, jsonl)
+    try:
+        if script is None:
+            runner.execute(args)
+        else:
+            runner.run_script(script)
+    finally:
+        if script is not None and args.file != "-":
+            script.close()
+        app.close()
+        out.flush()
+    return 1 if runner.failures else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interactive menu without arguments, otherwise the non-interactive CLI"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run_cli(argv)
+    try:
+        app = TodoApp(TaskLog(os.environ.get("TODO_DATA_DIR", DEFAULT_DATA_DIR)))
+    except DataDirectoryLocked as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    try:
+        run_menu(app)
+    finally:
+        app.close()
+    return 0
+
+
+def run_menu(app: TodoApp):
+    """Interactive menu loop"""
     print("Welcome to the Todo Console Application!")
     print("This is Phase I of Hackathon II - In-Memory Python Console App")
 
     while True:
         print_menu()
-        choice = get_user_input("Select an option (1-8): ")
+        choice = get_user_input("Select an option (1-9): ")
 
         try:
             if choice == "1":
@@ -230,12 +604,21 @@ def main():
                     print("Please enter a valid task ID (number).")
 
             elif choice == "8":
+                # Search Tasks
+                query = get_user_input("Search for (all words must match, end a word with * for prefix): ")
+                if not query:
+                    print("Search query cannot be empty!")
+                    continue
+                print(f"\nTasks matching '{query}':")
+                app.search_tasks(query)
+
+            elif choice == "9":
                 # Exit
                 print("Thank you for using the Todo Console Application!")
                 break
 
             else:
-                print("Invalid option. Please select 1-8.")
+                print("Invalid option. Please select 1-9.")
 
         except KeyboardInterrupt:
             print("\n\nApplication interrupted. Goodbye!")
@@ -245,4 +628,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Inverted index over task titles and descriptions (standard library only).
+
+Text is split into lowercase word tokens; each token maps to a sorted
+array of the ids of tasks containing it (8 bytes per entry, where a set
+of ints costs about 60). New tasks get the highest id, so adding is an
+append; deleting is a binary search and a shift. TodoApp updates the
+index as tasks are added, edited and deleted, so a search never scans the
+task list.
+
+Queries are whitespace-separated terms that must all match (AND). A term
+ending in `*` matches every token starting with it: "groc* milk" finds
+tasks mentioning "groceries" or "grocery" and "milk". Prefix terms use a
+sorted copy of the vocabulary, rebuilt lazily after new tokens appear.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+TOKEN = re.compile(r"\w+")
+TERM = re.compile(r"(\w+)(\*?)")
+
+
+def tokenize(text: str) -> Set[str]:
+    return set(TOKEN.findall(text.lower()))
+
+
+def contains(ids: array, task_id: int) -> bool:
+    i = bisect_left(ids, task_id)
+    return i < len(ids) and ids[i] == task_id
+
+
+class SearchIndex:
+    """Token -> task id postings with prefix and multi-term AND queries"""
+
+    def __init__(self):
+        self.postings: Dict[str, array] = {}
+        self._vocabulary: Optional[List[str]] = []  # sorted tokens, None when stale
+
+    def add(self, task_id: int, text: str) -> None:
+        self._add_tokens(task_id, tokenize(text))
+
+    def remove(self, task_id: int, text: str) -> None:
+        self._remove_tokens(task_id, tokenize(text))
+
+    def replace(self, task_id: int, old_text: str, new_text: str) -> None:
+        """Re-index an edited task, touching only the tokens that changed"""
+        old, new = tokenize(old_text), tokenize(new_text)
+        self._remove_tokens(task_id, old - new)
+        self._add_tokens(task_id, new - old)
+
+    def _add_tokens(self, task_id: int, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = array("q")
+                self._vocabulary = None
+            if not ids or ids[-1] < task_id:
+                ids.append(task_id)
+            else:
+                # An edit added a word to an older task
+                insort(ids, task_id)
+
+    def _remove_tokens(self, task_id: int, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            i = bisect_left(ids, task_id)
+            if i < len(ids) and ids[i] == task_id:
+                del ids[i]
+            if not ids:
+                # Left in the sorted vocabulary; prefix lookups skip it
+                del self.postings[token]
+
+    def _prefixed(self, prefix: str) -> Iterable[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            yield vocabulary[i]
+            i += 1
+
+    def _matches(self, term: str, prefix: bool) -> Union[array, Set[int]]:
+        if not prefix:
+            return self.postings.get(term, array("q"))
+        ids: Set[int] = set()
+        for token in self._prefixed(term):
+            ids.update(self.postings.get(token, ()))
+        return ids
+
+    def search(self, query: str) -> List[int]:
+        """Ids, in order, of tasks matching every term of the query; empty for an empty query"""
+        terms = {(term, bool(star)) for term, star in TERM.findall(query.lower())}
+        if not terms:
+            return []
+        # Start from the smallest match so each step is bounded by the result so far
+        matches = sorted((self._matches(term, prefix) for term, prefix in terms), key=len)
+        if len(matches) == 1 and isinstance(matches[0], array):
+            return matches[0].tolist()
+        result = set(matches[0])
+        for ids in matches[1:]:
+            if not result:
+                break
+            if isinstance(ids, array) and len(result) * 20 < len(ids):
+                # Binary-search the few candidates rather than walk the long array
+                result = {task_id for task_id in result if contains(ids, task_id)}
+            else:
+                result.intersection_update(ids)
+        return sorted(result)
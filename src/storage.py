@@ -0,0 +1,230 @@
+"""
+Crash-safe persistence for the console TodoApp (standard library only).
+
+State lives in a data directory as
+
+    snapshot.jsonl    header line {"generation": G, "next_id": N}, then one
+                      task per line
+    ops-<G>.log       operations applied after that snapshot, one JSON
+                      object per line
+
+Every change is appended to the current log and flushed to the operating
+system at once, so the process dying loses nothing. The fsync that makes it
+survive an OS crash or power loss is batched: every `fsync_every` operations,
+on the first append `fsync_interval` seconds after the last one, and on
+close. Such a crash can lose at most the unsynced tail, never corrupt
+earlier state. A torn last line is detected and dropped on load.
+
+Once the log holds more operations than the snapshot holds tasks (and at
+least `compact_min_ops`), the state is rewritten as a new snapshot of
+generation G+1 and a fresh log is started. Loading reads one snapshot plus
+a tail no longer than the live task set, however long the history is.
+The snapshot is replaced atomically (temporary file, fsync, rename), so a
+crash mid-compaction leaves the previous snapshot and its log intact.
+
+Only one process may have a data directory open: load() takes an exclusive
+lock on its LOCK file and close() releases it. Two writers would hand out
+the same ids and one could delete a log the other is still appending to.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SNAPSHOT = "snapshot.jsonl"
+LOCK = "LOCK"
+
+
+class DataDirectoryLocked(RuntimeError):
+    """Raised when another process already has the data directory open"""
+
+
+class TaskLog:
+    """Append-only operation log with snapshot compaction"""
+
+    def __init__(
+        self,
+        directory: str,
+        fsync_every: int = 1000,
+        fsync_interval: float = 1.0,
+        compact_min_ops: int = 10000,
+    ):
+        self.directory = directory
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_min_ops = compact_min_ops
+        self.generation = 0
+        self.log_ops = 0
+        self._file = None
+        self._lock = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"ops-{generation}.log")
+
+    # Loading
+
+    def load(self) -> Tuple[Dict[int, dict], int]:
+        """
+        Read the snapshot and replay the log after it. Returns the task
+        records by id and the next id to assign; opens the log for appends.
+        """
+        self._acquire_lock()
+        try:
+            return self._load()
+        except BaseException:
+            self._release_lock()
+            raise
+
+    def _acquire_lock(self) -> None:
+        lock = open(os.path.join(self.directory, LOCK), "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock.close()
+            raise DataDirectoryLocked(
+                f"{self.directory} is in use by another todo process; close it and try again"
+            ) from None
+        self._lock = lock
+
+    def _release_lock(self) -> None:
+        if self._lock is None:
+            return
+        # flock goes with the descriptor; msvcrt locks are released explicitly
+        if fcntl is None:
+            self._lock.seek(0)
+            msvcrt.locking(self._lock.fileno(), msvcrt.LK_UNLCK, 1)
+        self._lock.close()
+        self._lock = None
+
+    def _load(self) -> Tuple[Dict[int, dict], int]:
+        tasks: Dict[int, dict] = {}
+        next_id = 1
+        snapshot = os.path.join(self.directory, SNAPSHOT)
+        if os.path.exists(snapshot):
+            with open(snapshot, encoding="utf-8") as file:
+                header = json.loads(file.readline())
+                self.generation = header["generation"]
+                next_id = header["next_id"]
+                for line in file:
+                    record = json.loads(line)
+                    tasks[record["id"]] = record
+
+        log_path = self._log_path(self.generation)
+        valid_bytes = 0
+        if os.path.exists(log_path):
+            with open(log_path, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break  # torn write at the tail
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break
+                    next_id = apply(tasks, op, next_id)
+                    valid_bytes += len(line)
+                    self.log_ops += 1
+            if valid_bytes < os.path.getsize(log_path):
+                with open(log_path, "r+b") as file:
+                    file.truncate(valid_bytes)
+
+        self._remove_stale_logs()
+        self._file = open(log_path, "a", encoding="utf-8")
+        return tasks, next_id
+
+    def _remove_stale_logs(self) -> None:
+        current = os.path.basename(self._log_path(self.generation))
+        for name in os.listdir(self.directory):
+            if name.startswith("ops-") and name.endswith(".log") and name != current:
+                os.remove(os.path.join(self.directory, name))
+
+    # Writing
+
+    def append(self, op: dict) -> None:
+        self._file.write(json.dumps(op, separators=(",", ":")) + "\n")
+        # Out of Python's buffer right away; only the fsync is batched
+        self._file.flush()
+        self.log_ops += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Fsync the operations appended since the last sync to disk"""
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def should_compact(self, live_tasks: int) -> bool:
+        return self.log_ops >= max(self.compact_min_ops, live_tasks)
+
+    def compact(self, records: Iterator[dict], next_id: int) -> None:
+        """Write the current state as a new snapshot and start an empty log"""
+        self.sync()
+        generation = self.generation + 1
+        snapshot = os.path.join(self.directory, SNAPSHOT)
+        temporary = snapshot + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"generation": generation, "next_id": next_id}) + "\n")
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        new_log = open(self._log_path(generation), "a", encoding="utf-8")
+        os.replace(temporary, snapshot)
+        self._fsync_directory()
+
+        self._file.close()
+        self._file = new_log
+        self.generation = generation
+        self.log_ops = 0
+        self._remove_stale_logs()
+
+    def _fsync_directory(self) -> None:
+        if hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        self._release_lock()
+
+
+def apply(tasks: Dict[int, dict], op: dict, next_id: int) -> int:
+    """
+    Apply one logged operation to task records. Operations carry absolute
+    values (toggle records the resulting state), so replay is idempotent.
+    """
+    kind = op["op"]
+    if kind == "add":
+        record = {key: value for key, value in op.items() if key != "op"}
+        tasks[record["id"]] = record
+        return max(next_id, record["id"] + 1)
+    record = tasks.get(op["id"])
+    if kind == "delete":
+        tasks.pop(op["id"], None)
+    elif record is not None:
+        record.update((key, value) for key, value in op.items() if key not in ("op", "id"))
+    return next_id
@@ -1,28 +1,132 @@
 #!/usr/bin/env python3
 """
 Script to start the backend server for the Todo App
+
+Development (default): one uvicorn process that reloads on code changes.
+Production (--prod, or BACKEND_MODE=production): one worker per core, with
+uvloop/httptools when installed, tuned keep-alive and backlog, workers
+recycled after a number of requests, and a graceful shutdown timeout.
+When gunicorn is installed it supervises uvicorn workers and preloads the
+app once before forking; otherwise uvicorn's own supervisor is used.
+
+Every option can also be set through the environment variable shown in
+--help.
 """
+import argparse
+import importlib.util
+import os
 import subprocess
 import sys
-import os
 
-def start_backend():
-    """Start the FastAPI backend server"""
-    backend_dir = os.path.join(os.path.dirname(__file__), "backend")
+APP = "backend.main:app"
+
+
+def env(name, default):
+    return os.environ.get(name, default)
+
+
+def has_module(name):
+    return importlib.util.find_spec(name) is not None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--prod", dest="mode", action="store_const", const="production",
+        help="production mode (BACKEND_MODE=production)"
+    )
+    mode.add_argument(
+        "--dev", dest="mode", action="store_const", const="development",
+        help="development mode with auto-reload (default)"
+    )
+    parser.add_argument("--host", default=env("BACKEND_HOST", None),
+                        help="bind address (BACKEND_HOST; default 127.0.0.1, 0.0.0.0 in production)")
+    parser.add_argument("--port", type=int, default=int(env("BACKEND_PORT", 8000)), help="BACKEND_PORT")
+    parser.add_argument("--workers", type=int, default=int(env("WEB_CONCURRENCY", os.cpu_count() or 1)),
+                        help="production worker processes (WEB_CONCURRENCY; default: number of cores)")
+    parser.add_argument("--keep-alive", type=int, default=int(env("BACKEND_KEEP_ALIVE", 5)),
+                        help="seconds to hold idle keep-alive connections (BACKEND_KEEP_ALIVE)")
+    parser.add_argument("--backlog", type=int, default=int(env("BACKEND_BACKLOG", 2048)),
+                        help="listen socket backlog (BACKEND_BACKLOG)")
+    parser.add_argument("--max-requests", type=int, default=int(env("BACKEND_MAX_REQUESTS", 10000)),
+                        help="restart a worker after this many requests, 0 to disable (BACKEND_MAX_REQUESTS)")
+    parser.add_argument("--graceful-timeout", type=int, default=int(env("BACKEND_GRACEFUL_TIMEOUT", 30)),
+                        help="seconds to let in-flight requests finish on shutdown (BACKEND_GRACEFUL_TIMEOUT)")
+    args = parser.parse_args(argv)
+    args.mode = args.mode or env("BACKEND_MODE", "development")
+    if args.host is None:
+        args.host = "0.0.0.0" if args.mode == "production" else "127.0.0.1"
+    return args
 
-    # Change to backend directory
-    os.chdir(backend_dir)
 
-    # Start the uvicorn server
+def development_command(args):
+    return [
+        sys.executable, "-m", "uvicorn", APP,
+        "--reload", "--reload-dir", "backend",
+        "--host", args.host,
+        "--port", str(args.port),
+    ]
+
+
+def gunicorn_command(args):
+    worker = "uvicorn.workers.UvicornWorker"
     cmd = [
-        sys.executable, "-m", "uvicorn",
-        "main:app",
-        "--reload",
-        "--port", "8000"
+        sys.executable, "-m", "gunicorn", APP,
+        "--config", "python:backend.gunicorn_conf",
+        "--worker-class", worker,
+        "--preload",
+        "--workers", str(args.workers),
+        "--bind", f"{args.host}:{args.port}",
+        "--keep-alive", str(args.keep_alive),
+        "--backlog", str(args.backlog),
+        "--graceful-timeout", str(args.graceful_timeout),
     ]
+    if args.max_requests:
+        # Jitter keeps the workers from all restarting at the same moment
+        cmd += ["--max-requests", str(args.max_requests),
+                "--max-requests-jitter", str(max(1, args.max_requests // 10))]
+    return cmd
+
+
+def uvicorn_command(args):
+    cmd = [
+        sys.executable, "-m", "uvicorn", APP,
+        "--host", args.host,
+        "--port", str(args.port),
+        "--workers", str(args.workers),
+        "--loop", "uvloop" if has_module("uvloop") else "asyncio",
+        "--http", "httptools" if has_module("httptools") else "h11",
+        "--timeout-keep-alive", str(args.keep_alive),
+        "--backlog", str(args.backlog),
+        "--timeout-graceful-shutdown", str(args.graceful_timeout),
+        "--no-access-log",
+    ]
+    if args.max_requests:
+        cmd += ["--limit-max-requests", str(args.max_requests)]
+    return cmd
+
+
+def start_backend(argv=None):
+    """Start the FastAPI backend server"""
+    args = parse_args(argv)
+
+    # The backend is a package with relative imports, so run from the repository root
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-    print("Starting backend server on http://localhost:8000")
-    print("Press Ctrl+C to stop the server")
+    if args.mode == "production":
+        # Bring the schema up to date once, before several workers start at once
+        subprocess.run([sys.executable, "-m", "backend.manage", "init-db"], check=True)
+        cmd = gunicorn_command(args) if has_module("gunicorn") else uvicorn_command(args)
+        print(f"Starting backend server on http://{args.host}:{args.port} "
+              f"(production, {args.workers} workers, {os.path.basename(cmd[2])})")
+        if os.name == "posix":
+            # Replace this process so SIGTERM from a supervisor reaches the server directly
+            os.execv(sys.executable, cmd)
+    else:
+        cmd = development_command(args)
+        print(f"Starting backend server on http://{args.host}:{args.port}")
+        print("Press Ctrl+C to stop the server")
 
     try:
         subprocess.run(cmd)
@@ -30,4 +134,4 @@ def start_backend():
         print("\nServer stopped.")
 
 if __name__ == "__main__":
-    start_backend()
\ No newline at end of file
+    start_backend()
@@ -4,7 +4,14 @@ Test script for Todo Console Application
 This script tests all the basic functionality without requiring user input
 """
 
-from src.main import TodoApp
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from src.main import TodoApp, run_cli
+from src.storage import DataDirectoryLocked, TaskLog
 
 def test_todo_app():
     print("Testing Todo Console Application...")
@@ -47,5 +54,137 @@ def test_todo_app():
 
     print("\nAll tests completed successfully!")
 
+def test_persistence():
+    print("\nTesting persistence across restarts...")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        # A low compaction threshold exercises snapshot + log replay together
+        app = TodoApp(TaskLog(data_dir, compact_min_ops=3))
+        app.add_task("Buy groceries", "Milk, eggs, bread")
+        app.add_task("Complete Hackathon Phase I", "Implement console app")
+        app.add_task("Write report")
+        app.toggle_task_completion(1)
+        app.update_task(3, description="Quarterly numbers")
+        app.delete_task(2)
+        app.close()
+
+        reopened = TodoApp(TaskLog(data_dir))
+        assert sorted(reopened.tasks) == [1, 3]
+        assert reopened.tasks[1].completed
+        assert reopened.tasks[3].description == "Quarterly numbers"
+        assert list(reopened.completed) == [1] and list(reopened.pending) == [3]
+        assert reopened.add_task("Next").id == 4
+        # Written through to the OS before close, so a process crash keeps it
+        log_path = os.path.join(data_dir, f"ops-{reopened.storage.generation}.log")
+        with open(log_path, encoding="utf-8") as log:
+            assert json.loads(log.read().splitlines()[-1])["title"] == "Next"
+
+        # A second writer on the same directory is refused until the first closes
+        try:
+            TaskLog(data_dir).load()
+            assert False, "second TaskLog opened a locked data directory"
+        except DataDirectoryLocked:
+            pass
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            assert run_cli(["--data-dir", data_dir, "list"], stdout=io.StringIO()) == 1
+        assert "in use by another todo process" in errors.getvalue()
+        reopened.close()
+        second = TaskLog(data_dir)
+        second.load()
+        second.close()
+
+    print("Persistence test completed successfully!")
+
+def test_status_indexes():
+    print("\nTesting filtered listing through the status indexes...")
+
+    app = TodoApp()
+    for i in range(1, 6):
+        app.add_task(f"Task {i}")
+    app.toggle_task_completion(4)
+    app.toggle_task_completion(2)
+    app.toggle_task_completion(4)
+    app.delete_task(5)
+
+    assert [task.id for task in app.select_tasks(show_completed=True)] == [2]
+    assert [task.id for task in app.select_tasks(show_completed=False)] == [1, 3, 4]
+    assert [task.id for task in app.list_tasks()] == [1, 2, 3, 4]
+
+    print("Status index test completed successfully!")
+
+def test_search():
+    print("\nTesting search...")
+
+    app = TodoApp()
+    app.add_task("Buy groceries", "Milk, eggs, bread")
+    app.add_task("Grocery budget", "Plan the month")
+    app.add_task("Call mom", "About the milk delivery")
+
+    def ids(query, **filters):
+        return [task.id for task in app.search_tasks(query, **filters)]
+
+    assert ids("milk") == [1, 3]
+    assert ids("MILK bread") == [1]
+    assert ids("groc*") == [1, 2]
+    assert ids("groc") == []
+    assert ids("groc* milk") == [1]
+
+    app.update_task(3, description="About the delivery")
+    assert ids("milk") == [1]
+    assert ids("delivery") == [3]
+    app.toggle_task_completion(2)
+    assert ids("groc*", show_completed=False) == [1]
+    app.delete_task(1)
+    assert ids("groc*") == [2]
+    assert ids("eggs") == []
+
+    print("Search test completed successfully!")
+
+def test_batch_cli():
+    print("\nTesting the non-interactive CLI...")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        script = io.StringIO(
+            'add "Buy groceries" "Milk, eggs"\n'
+            "# comment\n"
+            "add 'Call mom'\n"
+            "toggle 1\n"
+            "delete 7\n"
+            'update 2 --title "Call dad"\n'
+        )
+        out = io.StringIO()
+        status = run_cli(["--data-dir", data_dir, "--format", "jsonl", "run", "-"], stdin=script, stdout=out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert status == 1
+        assert [record.get("title") for record in records] == ["Buy groceries", "Call mom", "Buy groceries", None, "Call dad"]
+        assert records[3] == {"error": "Task with ID 7 not found", "line": 5}
+
+        out = io.StringIO()
+        assert run_cli(["--data-dir", data_dir, "--format", "jsonl", "list", "--pending"], stdout=out) == 0
+        assert [json.loads(line)["id"] for line in out.getvalue().splitlines()] == [2]
+
+        out = io.StringIO()
+        assert run_cli(["--data-dir", data_dir, "search", "milk"], stdout=out) == 0
+        assert "Buy groceries" in out.getvalue()
+
+        missing = os.path.join(data_dir, "missing.txt")
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            assert run_cli(["--data-dir", data_dir, "run", missing], stdout=io.StringIO()) == 1
+        assert errors.getvalue().startswith(f"error: {missing}: ")
+
+    quiet = io.StringIO()
+    app = TodoApp(quiet=True, out=quiet)
+    app.add_task("Silent")
+    app.list_tasks()
+    assert quiet.getvalue() == ""
+
+    print("CLI test completed successfully!")
+
 if __name__ == "__main__":
-    test_todo_app()
\ No newline at end of file
+    test_todo_app()
+    test_persistence()
+    test_status_indexes()
+    test_search()
+    test_batch_cli()
\ No newline at end of file
@@ -100,6 +100,52 @@ def test_imports():
         print(f"❌ Other error during import: {e}")
         return False
 
+def test_delta_sync_late_commit():
+    """Test that /changes delivers a row committed with an updated_at older than a token already handed out"""
+    print("Testing delta sync with a late commit...")
+
+    try:
+        from datetime import datetime, timedelta
+        from sqlmodel import Session, SQLModel, create_engine
+        from backend.config import settings
+        from backend.models.task import Task
+        from backend.models.user import User
+        from backend.utils.sync import SyncToken, safety_window, task_changes_statement
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+        return False
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    window = safety_window(settings.TASKS_SYNC_SAFETY_WINDOW_SECONDS, settings.SQLITE_BUSY_TIMEOUT_MS)
+    with Session(engine) as session:
+        user = User(email="sync@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+
+        # A write is stamped, then waits almost the whole busy timeout for the lock
+        handed_out = datetime.utcnow()
+        stamped = handed_out - timedelta(milliseconds=settings.SQLITE_BUSY_TIMEOUT_MS - 500)
+
+        # Meanwhile a client drains /changes and gets a token at the horizon
+        token = SyncToken(datetime.min, 0, handed_out - window, 0)
+        drained = session.execute(task_changes_statement(user.id, token, handed_out - window, 10)).all()
+        token = SyncToken(handed_out - window, 0, handed_out - window, 0)
+
+        # Only now does the row commit, older than the moment the token was issued
+        session.add(Task(title="late", user_id=user.id, created_at=stamped, updated_at=stamped))
+        session.commit()
+
+        later = handed_out + window + timedelta(seconds=1)
+        rows = session.execute(task_changes_statement(user.id, token, later - window, 10)).all()
+
+    titles = [row.title for row in rows]
+    if drained or titles != ["late"]:
+        print(f"❌ Late-committed task was not delivered: {titles}")
+        return False
+    print("✅ Late-committed task delivered on the next sync")
+    return True
+
 def main():
     """Run all tests"""
     print("Running Phase II Implementation Tests\n")
@@ -107,7 +153,8 @@ def main():
     tests = [
         test_backend_structure,
         test_frontend_structure,
-        test_imports
+        test_imports,
+        test_delta_sync_late_commit
     ]
 
     results = []